@@ -16,6 +16,8 @@ import os
 import sys
 from datetime import datetime
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
 
 # Import our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -24,7 +26,9 @@ from scripts.ai_script_generator import AIScriptGenerator
 from video_generation.video_generator import VideoGenerator
 from trend_analysis.trend_analyzer import TrendAnalyzer
 from uploading.youtube_automator import YouTubeAutomator
+from uploading.upload_queue import UploadQueue, UploadQueueDaemon
 from analytics.monetization_optimizer import MonetizationOptimizer
+from pipeline.staged_pipeline import StagedPipeline
 
 class AIYouTubeAgency:
     def __init__(self):
@@ -41,84 +45,252 @@ class AIYouTubeAgency:
         with open("config/channels_config.json", 'r') as f:
             self.config = json.load(f)
         
+        # Start uploads while the final video file is still being written
+        self.streaming_upload = self.config.get('global_settings', {}).get('streaming_upload', False)
+        self._upload_executor = None
+        self._upload_queue = None
+        
         print("✅ AI YouTube Agency ready for action!")
     
-    def generate_daily_content_for_all_channels(self):
-        """Generate and upload content for all 6 channels - Daily workflow"""
+    def generate_daily_content_for_all_channels(self, parallel: bool = False, max_workers: Optional[int] = None,
+                                                pipelined: bool = False):
+        """Generate and upload content for all 6 channels - Daily workflow
+
+        With parallel=True each channel's full pipeline runs in its own worker
+        process. max_workers defaults to global_settings.channel_workers.
+        With pipelined=True channels flow through a staged pipeline so one
+        channel renders while another uploads.
+        """
         
         print("\n🎬 Starting daily content generation for all channels...")
         
-        all_results = {}
+        if not parallel or pipelined:
+            # One concurrent round of trend fetches for every niche instead of one per channel
+            self.trend_analyzer.prefetch_trends()
         
-        for channel_id, channel_config in self.config['channels'].items():
-            print(f"\n{'='*50}")
-            print(f"📺 Processing {channel_config['name']}")
-            print(f"   Niche: {channel_config['niche']}")
-            print(f"   Target: {channel_config['target_age_group']}")
-            print(f"{'='*50}")
-            
-            try:
-                # Step 1: Analyze trends and get viral opportunities
-                print("🔍 Analyzing trends and viral opportunities...")
-                opportunities = self.trend_analyzer.get_viral_opportunities(channel_id)
-                best_topic = opportunities[0]['topic'] if opportunities else None
-                
-                print(f"   🎯 Best opportunity: {best_topic}")
-                print(f"   💰 Estimated revenue: ${self.trend_analyzer._estimate_revenue(opportunities[0], channel_config) if opportunities else 0}")
-                
-                # Step 2: Generate AI script
-                print("✍️ Generating AI-powered script...")
-                script_data = self.script_generator.generate_long_form_script(
-                    channel_id, topic=best_topic
-                )
-                
-                print(f"   📝 Title: {script_data['title']}")
-                print(f"   ⏱️ Duration: {script_data['estimated_duration_minutes']} minutes")
-                
-                # Step 3: Create professional video
-                print("🎥 Creating professional video...")
-                video_info = self.video_generator.generate_video(script_data, channel_id)
-                
-                print(f"   🎬 Video created: {video_info['video_path']}")
-                print(f"   🖼️ Thumbnail: {video_info['thumbnail_path']}")
-                
-                # Step 4: Upload with full optimization
-                print("📤 Uploading with SEO optimization...")
-                upload_result = self.youtube_automator.upload_video_optimized(video_info, channel_id)
-                
-                if upload_result.get('id'):
-                    print(f"   ✅ Upload successful! Video ID: {upload_result['id']}")
-                else:
-                    print(f"   ⚠️ Upload simulation (add YouTube credentials for real uploads)")
-                
-                # Step 5: Track monetization progress
-                print("📊 Analyzing monetization progress...")
-                progress = self.monetization_optimizer.track_monetization_progress(channel_id)
-                
-                print(f"   📈 Subscriber progress: {progress['progress_percentages']['subscribers']:.1f}%")
-                print(f"   ⏰ Est. time to monetization: {progress['estimated_time_remaining']['weeks_remaining']} weeks")
-                
-                # Store results
-                all_results[channel_id] = {
-                    'script': script_data,
-                    'video': video_info,
-                    'upload': upload_result,
-                    'progress': progress,
-                    'opportunities': opportunities[:3]  # Top 3 opportunities
-                }
-                
-                print(f"✅ {channel_config['name']} content pipeline completed!")
+        # Playlist insertions etc. of all channels go out together in a few batch requests
+        with self.youtube_automator.batched_post_upload():
+            if pipelined:
+                all_results = self._generate_channels_pipelined()
+            elif parallel:
+                all_results = self._generate_channels_in_parallel(max_workers)
+            else:
+                all_results = {}
                 
-            except Exception as e:
-                print(f"❌ Error processing {channel_id}: {str(e)}")
-                all_results[channel_id] = {'error': str(e)}
-                continue
+                for channel_id, channel_config in self.config['channels'].items():
+                    all_results[channel_id] = self._run_channel_pipeline(channel_id, channel_config)
         
         # Generate daily summary report
         self._generate_daily_report(all_results)
         
         return all_results
     
+    def _run_channel_pipeline(self, channel_id: str, channel_config: Dict) -> Dict:
+        """Run trend -> script -> video -> upload -> progress for one channel"""
+        
+        print(f"\n{'='*50}")
+        print(f"📺 Processing {channel_config['name']}")
+        print(f"   Niche: {channel_config['niche']}")
+        print(f"   Target: {channel_config['target_age_group']}")
+        print(f"{'='*50}")
+        
+        job = {'channel_id': channel_id, 'channel_config': channel_config}
+        
+        try:
+            for _, stage, _ in self._pipeline_stages():
+                job = stage(job)
+            
+            print(f"✅ {channel_config['name']} content pipeline completed!")
+            
+            return self._channel_result(job)
+            
+        except Exception as e:
+            print(f"❌ Error processing {channel_id}: {str(e)}")
+            return {'error': str(e)}
+    
+    def _pipeline_stages(self) -> List[Tuple[str, Callable[[Dict], Dict], int]]:
+        """Daily workflow stages as (name, stage, workers) in run order"""
+        
+        workers = self.config.get('global_settings', {}).get('pipeline_stage_workers', {})
+        
+        return [
+            ('trends', self._stage_analyze_trends, workers.get('trends', 1)),
+            ('script', self._stage_generate_script, workers.get('script', 1)),
+            # One render worker by default: the TTS engine is shared by the generator
+            ('render', self._stage_render_video, workers.get('render', 1)),
+            ('upload', self._stage_upload_video, workers.get('upload', 2)),
+            ('progress', self._stage_track_progress, workers.get('progress', 1))
+        ]
+    
+    def _stage_analyze_trends(self, job: Dict) -> Dict:
+        """Step 1: Analyze trends and get viral opportunities"""
+        
+        channel_id, channel_config = job['channel_id'], job['channel_config']
+        
+        print(f"🔍 [{channel_config['name']}] Analyzing trends and viral opportunities...")
+        opportunities = self.trend_analyzer.get_viral_opportunities(channel_id)
+        best_topic = opportunities[0]['topic'] if opportunities else None
+        
+        print(f"   🎯 Best opportunity: {best_topic}")
+        print(f"   💰 Estimated revenue: ${self.trend_analyzer._estimate_revenue(opportunities[0], channel_config) if opportunities else 0}")
+        
+        job['opportunities'] = opportunities
+        job['best_topic'] = best_topic
+        return job
+    
+    def _stage_generate_script(self, job: Dict) -> Dict:
+        """Step 2: Generate AI script"""
+        
+        print(f"✍️ [{job['channel_config']['name']}] Generating AI-powered script...")
+        script_data = self.script_generator.generate_long_form_script(
+            job['channel_id'], topic=job['best_topic']
+        )
+        
+        print(f"   📝 Title: {script_data['title']}")
+        print(f"   ⏱️ Duration: {script_data['estimated_duration_minutes']} minutes")
+        
+        job['script'] = script_data
+        return job
+    
+    def _stage_render_video(self, job: Dict) -> Dict:
+        """Step 3: Create professional video"""
+        
+        print(f"🎥 [{job['channel_config']['name']}] Creating professional video...")
+        
+        stream_to = None
+        if self.streaming_upload:
+            def stream_to(streaming_video):
+                # The upload stage picks up this future instead of starting its own upload
+                job['upload_future'] = self._get_upload_executor().submit(
+                    self.youtube_automator.upload_video_optimized, streaming_video, job['channel_id']
+                )
+        
+        try:
+            video_info = self.video_generator.generate_video(job['script'], job['channel_id'], stream_to=stream_to)
+        except Exception:
+            # Let a streaming upload notice the failed encode and finish before the job is dropped
+            if 'upload_future' in job:
+                job.pop('upload_future').result()
+            raise
+        
+        print(f"   🎬 Video created: {video_info['video_path']}")
+        print(f"   🖼️ Thumbnail: {video_info['thumbnail_path']}")
+        
+        job['video'] = video_info
+        return job
+    
+    def _stage_upload_video(self, job: Dict) -> Dict:
+        """Step 4: Upload with full optimization"""
+        
+        if 'upload_future' in job:
+            print(f"📤 [{job['channel_config']['name']}] Finishing streamed upload...")
+            upload_result = job.pop('upload_future').result()
+        else:
+            print(f"📤 [{job['channel_config']['name']}] Uploading with SEO optimization...")
+            upload_result = self.youtube_automator.upload_video_optimized(job['video'], job['channel_id'])
+        
+        if upload_result.get('id'):
+            print(f"   ✅ Upload successful! Video ID: {upload_result['id']}")
+        else:
+            print(f"   ⚠️ Upload simulation (add YouTube credentials for real uploads)")
+        
+        job['upload'] = upload_result
+        return job
+    
+    def _get_upload_executor(self) -> ThreadPoolExecutor:
+        """Threads running streamed uploads alongside the encoder"""
+        if self._upload_executor is None:
+            workers = self.config.get('global_settings', {}).get('pipeline_stage_workers', {}).get('upload', 2)
+            self._upload_executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='upload')
+        return self._upload_executor
+    
+    def _stage_track_progress(self, job: Dict) -> Dict:
+        """Step 5: Track monetization progress"""
+        
+        print(f"📊 [{job['channel_config']['name']}] Analyzing monetization progress...")
+        progress = self.monetization_optimizer.track_monetization_progress(job['channel_id'])
+        
+        print(f"   📈 Subscriber progress: {progress['progress_percentages']['subscribers']:.1f}%")
+        print(f"   ⏰ Est. time to monetization: {progress['estimated_time_remaining']['weeks_remaining']} weeks")
+        
+        job['progress'] = progress
+        return job
+    
+    def _channel_result(self, job: Dict) -> Dict:
+        """Shape a finished job into the per-channel entry of the daily results"""
+        
+        return {
+            'script': job['script'],
+            'video': job['video'],
+            'upload': job['upload'],
+            'progress': job['progress'],
+            'opportunities': job['opportunities'][:3]  # Top 3 opportunities
+        }
+    
+    def _generate_channels_in_parallel(self, max_workers: Optional[int] = None) -> Dict:
+        """Run every channel pipeline on a process pool, one channel per task"""
+        
+        channels = self.config['channels']
+        if max_workers is None:
+            max_workers = self.config.get('global_settings', {}).get('channel_workers', os.cpu_count() or 1)
+        max_workers = max(1, min(max_workers, len(channels)))
+        
+        print(f"⚡ Running {len(channels)} channel pipelines on {max_workers} worker processes...")
+        
+        results = {}
+        
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_channel_worker) as executor:
+            futures = {
+                executor.submit(_run_channel_pipeline_in_worker, channel_id): channel_id
+                for channel_id in channels
+            }
+            
+            for future in as_completed(futures):
+                channel_id = futures[future]
+                try:
+                    results[channel_id], post_upload_calls = future.result()
+                except Exception as e:
+                    # Worker crashed or result could not be sent back
+                    print(f"❌ Error processing {channel_id}: {str(e)}")
+                    results[channel_id] = {'error': str(e)}
+                    continue
+                
+                # Workers hand their playlist insertions etc. back so they join our batch
+                self.youtube_automator.replay_post_upload_calls(post_upload_calls)
+        
+        # Keep the report in config order, not completion order
+        return {channel_id: results[channel_id] for channel_id in channels}
+    
+    def _generate_channels_pipelined(self) -> Dict:
+        """Stream all channels through bounded queues between the workflow stages"""
+        
+        channels = self.config['channels']
+        queue_size = self.config.get('global_settings', {}).get('pipeline_queue_size', 1)
+        
+        print(f"🏭 Running {len(channels)} channels through the staged pipeline...")
+        
+        def on_error(job, stage_name, error):
+            print(f"❌ Error processing {job['channel_id']} ({stage_name} stage): {str(error)}")
+            job['error'] = str(error)
+            return job
+        
+        pipeline = StagedPipeline(self._pipeline_stages(), queue_size=queue_size, on_error=on_error)
+        finished = pipeline.run(
+            {'channel_id': channel_id, 'channel_config': channel_config}
+            for channel_id, channel_config in channels.items()
+        )
+        
+        results = {}
+        for job in finished:
+            if 'error' in job:
+                results[job['channel_id']] = {'error': job['error']}
+            else:
+                print(f"✅ {job['channel_config']['name']} content pipeline completed!")
+                results[job['channel_id']] = self._channel_result(job)
+        
+        # Keep the report in config order, not completion order
+        return {channel_id: results[channel_id] for channel_id in channels}
+    
     def analyze_all_channels_performance(self):
         """Analyze performance across all channels for optimization"""
         
@@ -216,7 +388,10 @@ class AIYouTubeAgency:
             [v['video'] for v in sprint_videos], channel_id
         )
         
-        print(f"\n🚀 Sprint complete! {len(sprint_videos)} videos ready for upload")
+        # Persist the schedule; the upload queue daemon fires each upload when it falls due
+        self._get_upload_queue().enqueue_scheduled(scheduled_uploads)
+        
+        print(f"\n🚀 Sprint complete! {len(sprint_videos)} videos queued for upload")
         print("📅 Upload schedule:")
         
         for i, upload in enumerate(scheduled_uploads):
@@ -228,6 +403,43 @@ class AIYouTubeAgency:
             'estimated_boost': "Expected 3-5x subscriber growth during sprint week"
         }
     
+    def _get_upload_queue(self) -> UploadQueue:
+        """Durable queue of scheduled uploads, opened on first use"""
+        
+        if self._upload_queue is None:
+            settings = self.config.get('global_settings', {})
+            self._upload_queue = UploadQueue(
+                settings.get('upload_queue_db', 'data/upload_queue.db'),
+                lease_seconds=settings.get('upload_queue_lease_seconds', 900),
+                max_attempts=settings.get('upload_queue_max_attempts', 5)
+            )
+        
+        return self._upload_queue
+    
+    def run_upload_queue_daemon(self):
+        """Upload queued videos at their scheduled times until interrupted"""
+        
+        settings = self.config.get('global_settings', {})
+        daemon = UploadQueueDaemon(
+            self._get_upload_queue(), self.youtube_automator,
+            workers=settings.get('upload_queue_workers', 2),
+            poll_interval=settings.get('upload_queue_poll_seconds', 30)
+        )
+        daemon.run_forever()
+        
+        return self._get_upload_queue().stats()
+    
+    def close(self):
+        """Wait for streamed uploads still running, release the upload queue and the trend source threads"""
+        
+        self.trend_analyzer.close()
+        if self._upload_executor is not None:
+            self._upload_executor.shutdown(wait=True)
+            self._upload_executor = None
+        if self._upload_queue is not None:
+            self._upload_queue.close()
+            self._upload_queue = None
+    
     def _generate_daily_report(self, results: dict):
         """Generate daily performance report"""
         
@@ -244,6 +456,11 @@ class AIYouTubeAgency:
         print(f"   ❌ Errors: {total_errors}")
         print(f"   🎯 Success rate: {(total_videos/(total_videos+total_errors)*100):.1f}%" if total_videos+total_errors > 0 else "   🎯 Success rate: 0%")
         
+        quota = self.youtube_automator.quota_report()
+        for project, usage in quota.items():
+            print(f"   🎟️  API quota ({project}): {usage['remaining']}/{usage['limit']} units left, "
+                  f"{usage['uploads_remaining']} more uploads fit today")
+        
         print(f"\n📺 CHANNEL BREAKDOWN:")
         
         for channel_id, result in results.items():
@@ -267,11 +484,27 @@ class AIYouTubeAgency:
                     'errors': total_errors,
                     'success_rate': (total_videos/(total_videos+total_errors)*100) if total_videos+total_errors > 0 else 0
                 },
-                'results': results
+                'results': results,
+                'api_quota': quota
             }, f, indent=2)
         
         print(f"\n💾 Report saved to {report_file}")
 
+# Per-process agency used by the parallel daily workflow
+_worker_agency = None
+
+def _init_channel_worker():
+    """Build a private agency in each worker (TTS engines and API clients are not shareable)"""
+    global _worker_agency
+    _worker_agency = AIYouTubeAgency()
+
+def _run_channel_pipeline_in_worker(channel_id: str) -> Tuple[Dict, List[Dict]]:
+    """Process pool entry point for a single channel pipeline; returns its result and post-upload calls"""
+    channel_config = _worker_agency.config['channels'][channel_id]
+    with _worker_agency.youtube_automator.handed_off_post_upload() as post_upload_calls:
+        result = _worker_agency._run_channel_pipeline(channel_id, channel_config)
+    return result, post_upload_calls
+
 def main():
     """Main entry point for the AI YouTube Agency"""
     
@@ -288,13 +521,18 @@ def main():
     print("3. 📅 Generate weekly content calendar")
     print("4. 🏃‍♂️ Run monetization sprint (single channel)")
     print("5. 🎯 Quick demo (single channel)")
+    print("6. ⏰ Run upload queue daemon")
     
     try:
-        choice = input("\nEnter your choice (1-5): ").strip()
+        choice = input("\nEnter your choice (1-6): ").strip()
         
         if choice == "1":
             print("\n🚀 Starting daily content generation...")
-            results = agency.generate_daily_content_for_all_channels()
+            settings = agency.config.get('global_settings', {})
+            results = agency.generate_daily_content_for_all_channels(
+                parallel=settings.get('parallel_channels', False),
+                pipelined=settings.get('staged_pipeline', False)
+            )
             print("\n✅ Daily content generation complete!")
             
         elif choice == "2":
@@ -337,6 +575,11 @@ def main():
             print(f"   📝 Script title: {script['title']}")
             print(f"   📈 Monetization progress: {progress['progress_percentages']['subscribers']:.1f}%")
             
+        elif choice == "6":
+            print("\n⏰ Starting upload queue daemon (Ctrl+C to stop)...")
+            queue_stats = agency.run_upload_queue_daemon()
+            print(f"\n✅ Upload queue: {queue_stats}")
+            
         else:
             print("❌ Invalid choice")
             
@@ -345,6 +588,8 @@ def main():
     except Exception as e:
         print(f"\n❌ An error occurred: {str(e)}")
         print("Check the logs and try again.")
+    finally:
+        agency.close()
 
 if __name__ == "__main__":
     main()
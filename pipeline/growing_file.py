@@ -0,0 +1,140 @@
+"""
+Growing File - Read a file while another process is still writing it
+
+This module:
+- Exposes a file that is being appended to as a blocking, seekable reader
+- Lets the writer side mark the file finished (or failed) so readers know where it ends
+- Gives up on writers that stop making progress instead of hanging forever
+"""
+
+import io
+import os
+import threading
+import time
+from typing import Optional
+
+class GrowingFile(io.RawIOBase):
+    def __init__(self, path: str, poll_interval: float = 0.05, stall_timeout: float = 600.0):
+        """
+        path: file the writer appends to (it may not exist yet)
+        poll_interval: seconds between size checks while waiting for data
+        stall_timeout: seconds without growth after which reads fail
+        """
+        super().__init__()
+        self.path = path
+        self.poll_interval = poll_interval
+        self.stall_timeout = stall_timeout
+        self._position = 0
+        self._handle = None
+        self._done = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    # Writer side
+
+    def finish(self):
+        """The writer is done; the current size is final"""
+        self._done.set()
+
+    def fail(self, error: BaseException):
+        """The writer failed; pending and future reads raise"""
+        self._error = error
+        self._done.set()
+
+    # Reader side
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def available(self) -> int:
+        """Bytes written so far"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def final_size(self) -> Optional[int]:
+        """Total size once the writer finished, None while it is still writing"""
+        self._raise_if_failed()
+        return self.available() if self.finished else None
+
+    def wait_for(self, size: int) -> int:
+        """Block until at least size bytes exist or the writer finished; returns bytes available"""
+
+        last_size, last_growth = -1, time.monotonic()
+
+        while True:
+            self._raise_if_failed()
+
+            # Check completion before the size so no bytes written before finish() are missed
+            finished = self.finished
+            current = self.available()
+
+            if current >= size or finished:
+                return current
+
+            if current != last_size:
+                last_size, last_growth = current, time.monotonic()
+            elif time.monotonic() - last_growth > self.stall_timeout:
+                raise IOError(f"{self.path} stopped growing at {current} bytes")
+
+            self._done.wait(self.poll_interval)
+
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise IOError(f"Writer of {self.path} failed: {self._error}")
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._position = offset
+        elif whence == io.SEEK_CUR:
+            self._position += offset
+        elif whence == io.SEEK_END:
+            self._position = self.available() + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        """Read size bytes from the current position, waiting for the writer as needed"""
+
+        if size is None or size < 0:
+            # Everything, which is only known once the writer is done
+            while not self.finished:
+                self.wait_for(self.available() + 1)
+            end = self.available()
+        else:
+            end = min(self.wait_for(self._position + size), self._position + size)
+
+        if end <= self._position:
+            return b''
+
+        if self._handle is None:
+            self._handle = open(self.path, 'rb')
+
+        self._handle.seek(self._position)
+        data = self._handle.read(end - self._position)
+        self._position += len(data)
+
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        super().close()
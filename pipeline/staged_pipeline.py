@@ -0,0 +1,124 @@
+"""
+Staged Pipeline - Runs jobs through a chain of stages connected by bounded queues
+
+This module:
+- Gives every stage its own worker threads
+- Connects stages with bounded queues so fast stages can't run away from slow ones
+- Lets different jobs sit in different stages at the same time
+- Pulls failed jobs out of the chain without stopping the other jobs
+"""
+
+import queue
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Marks the end of the job stream on a queue
+_STOP = object()
+
+class StagedPipeline:
+    def __init__(self, stages: List[Tuple[str, Callable[[Dict], Dict], int]], queue_size: int = 1,
+                 on_error: Optional[Callable[[Dict, str, Exception], Dict]] = None):
+        """
+        stages: (name, func, workers) tuples, run in order. func receives the job
+        dict and returns the job dict to pass on to the next stage.
+        queue_size: capacity of each queue between two stages.
+        on_error: called as on_error(job, stage_name, exception) and returns the
+        job to report. Defaults to storing the message under job['error'].
+        """
+        if not stages:
+            raise ValueError("StagedPipeline needs at least one stage")
+
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.on_error = on_error or self._default_on_error
+
+    @staticmethod
+    def _default_on_error(job: Dict, stage_name: str, error: Exception) -> Dict:
+        job['error'] = str(error)
+        job['failed_stage'] = stage_name
+        return job
+
+    def run(self, jobs: Iterable[Dict]) -> List[Dict]:
+        """Push every job through all stages and return them in completion order"""
+
+        # One inbound queue per stage plus an unbounded sink for finished jobs
+        inbound = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        sink = queue.Queue()
+
+        threads = []
+
+        for index, (name, func, workers) in enumerate(self.stages):
+            workers = max(1, workers)
+            outbound = inbound[index + 1] if index + 1 < len(self.stages) else sink
+            next_workers = max(1, self.stages[index + 1][2]) if index + 1 < len(self.stages) else 1
+
+            # The last worker of a stage to exit forwards the stop markers downstream
+            remaining = {'workers': workers}
+            lock = threading.Lock()
+
+            for worker_index in range(workers):
+                thread = threading.Thread(
+                    target=self._stage_worker,
+                    args=(name, func, inbound[index], outbound, sink, remaining, lock, next_workers),
+                    name=f"pipeline-{name}-{worker_index}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        feeder = threading.Thread(
+            target=self._feed, args=(jobs, inbound[0], max(1, self.stages[0][2])),
+            name="pipeline-feeder", daemon=True
+        )
+        feeder.start()
+
+        finished = []
+
+        while True:
+            job = sink.get()
+            if job is _STOP:
+                break
+            finished.append(job)
+
+        feeder.join()
+        for thread in threads:
+            thread.join()
+
+        return finished
+
+    @staticmethod
+    def _feed(jobs: Iterable[Dict], first_queue: queue.Queue, first_workers: int):
+        """Feed jobs into the first stage, blocking whenever it is full"""
+        for job in jobs:
+            first_queue.put(job)
+
+        for _ in range(first_workers):
+            first_queue.put(_STOP)
+
+    def _stage_worker(self, name: str, func: Callable[[Dict], Dict], inbound: queue.Queue,
+                      outbound: queue.Queue, sink: queue.Queue, remaining: Dict,
+                      lock: threading.Lock, next_workers: int):
+        """Worker loop for one thread of a stage"""
+
+        while True:
+            job = inbound.get()
+
+            if job is _STOP:
+                break
+
+            try:
+                job = func(job)
+            except Exception as e:
+                # Failed jobs skip the remaining stages
+                sink.put(self.on_error(job, name, e))
+                continue
+
+            outbound.put(job)
+
+        with lock:
+            remaining['workers'] -= 1
+            last_worker = remaining['workers'] == 0
+
+        if last_worker:
+            for _ in range(next_workers):
+                outbound.put(_STOP)
@@ -0,0 +1,153 @@
+"""
+Keyword Index - Find every keyword class in a topic with one scan
+
+This module:
+- Compiles several named keyword lists into a single trie-shaped regular expression
+- Scans a topic once and returns a bitmask with one bit per keyword class that occurs in it
+- Classifies large batches column-wise, searching every distinct keyword once across all topics
+- Matches exactly like `any(keyword in text for keyword in keywords)` per class, overlaps included
+"""
+
+import re
+from typing import Dict, Iterable, Sequence
+
+import numpy as np
+
+class KeywordIndex:
+    def __init__(self, classes: Dict[str, Sequence[str]]):
+        """classes: class name -> keywords; at most 64 classes"""
+
+        if len(classes) > 64:
+            raise ValueError("KeywordIndex supports at most 64 keyword classes")
+
+        self.bits = {name: 1 << position for position, name in enumerate(classes)}
+
+        # Class bits of every distinct keyword
+        keyword_bits: Dict[str, int] = {}
+        for name, keywords in classes.items():
+            for keyword in keywords:
+                keyword_bits[keyword] = keyword_bits.get(keyword, 0) | self.bits[name]
+
+        # An empty keyword is "in" every text
+        self.always = keyword_bits.pop('', 0)
+
+        # The scan reports only the longest keyword starting at each position; every other keyword
+        # starting there is one of its prefixes, so each keyword carries its prefixes' bits too
+        self._masks = {
+            keyword: self._prefix_bits(keyword, keyword_bits) for keyword in keyword_bits
+        }
+
+        # Zero-width lookahead: try every start position, so overlapping keywords are all seen.
+        # The trie shape checks each character once per position instead of once per keyword
+        trie = _trie_pattern(keyword_bits) if keyword_bits else '(?!)'
+        self._pattern = re.compile('(?=(' + trie + '))')
+
+    @staticmethod
+    def _prefix_bits(keyword: str, keyword_bits: Dict[str, int]) -> int:
+        mask = 0
+        for end in range(1, len(keyword) + 1):
+            mask |= keyword_bits.get(keyword[:end], 0)
+        return mask
+
+    def bit(self, name: str) -> int:
+        return self.bits[name]
+
+    def classify(self, text: str) -> int:
+        """Bitmask of the classes with a keyword in text (callers lowercase text as needed)"""
+
+        mask = self.always
+        masks = self._masks
+        for keyword in self._pattern.findall(text):
+            mask |= masks[keyword]
+        return mask
+
+    def classify_many(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        classify() for every text, as a uint64 array
+        Large batches are faster column-wise: each distinct keyword is searched once over
+        all texts in C, and a keyword shared by several classes sets all their bits at once
+        """
+
+        result = np.full(len(texts), self.always, dtype=np.uint64)
+        if not texts or not self._masks:
+            return result
+
+        column = np.array(texts, dtype=str)
+        for keyword, mask in self._masks.items():
+            result[np.char.find(column, keyword) >= 0] |= np.uint64(mask)
+
+        return result
+
+    def has(self, mask: int, name: str) -> bool:
+        return bool(mask & self.bits[name])
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Alternation of the keywords factored into a character trie, longest match preferred"""
+
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[None] = True
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(
+            ((char, child) for char, child in node.items() if char is not None))]
+        if not branches:
+            return ''
+
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A keyword ends here: the greedy ? tries the longer keywords first and falls back to this one
+        return '(?:' + body + ')?' if None in node else body
+
+    return build(trie)
+
+def naive_classify(text: str, classes: Dict[str, Iterable[str]]) -> Dict[str, bool]:
+    """The per-class scans the index replaces (reference for tests and the benchmark)"""
+    return {name: any(keyword in text for keyword in keywords) for name, keywords in classes.items()}
+
+# Benchmark: one scan per topic vs one `in` test per keyword and class
+# Run from the repository root as a module: python -m trend_analysis.keyword_index
+if __name__ == "__main__":
+    import json
+    import os
+    import random
+    import time
+
+    from trend_analysis.scoring_engine import scoring_keyword_classes
+
+    with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'config', 'channels_config.json')) as f:
+        channel = next(iter(json.load(f)['channels'].values()))
+
+    classes = scoring_keyword_classes(channel['keywords'])
+    index = KeywordIndex(classes)
+
+    rng = random.Random(7)
+    vocabulary = sorted({word for keywords in classes.values() for keyword in keywords for word in keyword.split()})
+    vocabulary += ['amazing', 'daily', 'update', 'story', 'secret', 'home', 'music', 'travel', 'guide', 'the']
+    topics = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(3, 7))) for _ in range(100000)]
+
+    start = time.perf_counter()
+    expected = [naive_classify(topic, classes) for topic in topics]
+    naive = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single = [index.classify(topic) for topic in topics]
+    per_topic = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = index.classify_many(topics)
+    batched = time.perf_counter() - start
+
+    identical = all(
+        all(bool(mask & index.bit(name)) == hit for name, hit in classes_hit.items())
+        for mask, classes_hit in zip(single, expected)
+    ) and batch.tolist() == single
+
+    print(f"{len(topics)} topics, {len(classes)} keyword classes, {sum(map(len, classes.values()))} keywords")
+    print(f"Per-class scans:   {naive * 1000:.0f} ms")
+    print(f"Index, per topic:  {per_topic * 1000:.0f} ms")
+    print(f"Index, batched:    {batched * 1000:.0f} ms")
+    print(f"Identical results: {identical}")
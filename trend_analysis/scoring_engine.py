@@ -0,0 +1,224 @@
+"""
+Scoring Engine - Columnar, vectorized trend scoring
+
+This module:
+- Loads trend dicts into NumPy columns (views, growth, search volume, engagement, seasonal boost)
+- Computes viral score, monetization potential and competition level for all trends at once
+- Picks the top opportunities with argpartition instead of sorting every candidate
+- Reproduces TrendAnalyzer's per-dict scoring exactly, including rounding and tie order
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from trend_analysis.keyword_index import KeywordIndex
+
+# Keyword lists shared with TrendAnalyzer's per-dict scorers
+AFFILIATE_KEYWORDS = ['review', 'best', 'tool', 'product']
+COURSE_KEYWORDS = ['how to', 'guide', 'tutorial']
+HIGH_VALUE_KEYWORDS = ['expensive', 'premium', 'professional', 'business', 'investment']
+COMPETITION_KEYWORDS = ['viral', 'trending', 'popular', 'best', 'top']
+
+# Base monetization potential by niche
+NICHE_MULTIPLIERS = {
+    'technology': 3.5,  # High-value ads, affiliate potential
+    'health': 3.0,     # High-paying health ads
+    'lifestyle': 2.5,  # Good affiliate opportunities
+    'gaming': 2.0,     # Gaming ads, sponsorships
+    'motivation': 2.8, # Course/book sales potential
+    'education_kids': 2.2  # Educational product sales
+}
+
+def scoring_keyword_classes(channel_keywords: Sequence[str] = ()) -> Dict[str, Sequence[str]]:
+    """Every keyword list the scorers test topics against"""
+    return {
+        'channel': list(channel_keywords),
+        'affiliate': AFFILIATE_KEYWORDS,
+        'course': COURSE_KEYWORDS,
+        'high_value': HIGH_VALUE_KEYWORDS,
+        'competition': COMPETITION_KEYWORDS
+    }
+
+@lru_cache(maxsize=64)
+def scoring_keyword_index(channel_keywords: Tuple[str, ...] = ()) -> KeywordIndex:
+    """Compiled index of the scoring keyword classes for one channel's keywords"""
+    return KeywordIndex(scoring_keyword_classes(channel_keywords))
+
+def round_like_python(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    Round like Python's round(x, digits)
+    np.round scales by 10**digits first, which can tip values lying next to a
+    rounding boundary the wrong way; those few are redone with round()
+    """
+    rounded = np.round(values, digits)
+
+    scaled = values * 10.0 ** digits
+    near_boundary = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for index in np.flatnonzero(near_boundary):
+        rounded[index] = round(float(values[index]), digits)
+
+    return rounded
+
+class TrendColumns:
+    """Trends as parallel arrays; missing metrics become neutral values"""
+
+    def __init__(self, trends: Sequence[Dict], keyword_index: KeywordIndex):
+        self.trends = trends
+        self.size = len(trends)
+
+        def column(key: str, default: float) -> np.ndarray:
+            return np.fromiter((trend.get(key, default) for trend in trends), dtype=np.float64, count=self.size)
+
+        self.views = column('views', 0.0)
+        self.growth_rate = column('growth_rate', 0.0)
+        self.search_volume = column('search_volume', 0.0)
+        self.engagement_rate = column('engagement_rate', 0.0)
+        self.seasonal_boost = column('seasonal_boost', 1.0)
+        self.urgent = np.fromiter((trend.get('urgency') == 'high' for trend in trends), dtype=bool, count=self.size)
+
+        # One scan over all lowercased topics finds every keyword class at once
+        self.keyword_index = keyword_index
+        self.keyword_masks = keyword_index.classify_many([trend['topic'].lower() for trend in trends])
+
+    def contains(self, keyword_class: str) -> np.ndarray:
+        """Per trend: does its lowercased topic contain a keyword of the class"""
+        return (self.keyword_masks & np.uint64(self.keyword_index.bit(keyword_class))) != 0
+
+class ScoringEngine:
+    def __init__(self, channel: Dict):
+        self.channel = channel
+        self.keyword_index = scoring_keyword_index(tuple(channel['keywords']))
+
+    def viral_scores(self, columns: TrendColumns) -> np.ndarray:
+        """Vectorized TrendAnalyzer._calculate_viral_score"""
+
+        # Same order of additions as the per-dict scorer, so float results match bit for bit
+        score = np.minimum(columns.views / 1000000, 10)
+        score = score + np.minimum(columns.growth_rate / 10, 10)
+        score = score + np.minimum(columns.search_volume / 100000, 10)
+        score = score + np.where(columns.contains('channel'), 5.0, 0.0)
+        score = score + np.minimum(columns.engagement_rate, 5)
+        score = score * columns.seasonal_boost
+        score = score + np.where(columns.urgent, 3.0, 0.0)
+
+        return round_like_python(score, 2)
+
+    def monetization_potentials(self, columns: TrendColumns) -> np.ndarray:
+        """Vectorized TrendAnalyzer._calculate_monetization_potential"""
+
+        strategy = self.channel['monetization_strategy']
+        base_score = NICHE_MULTIPLIERS.get(self.channel['niche'], 2.0)
+
+        bonus = np.zeros(columns.size)
+        if 'affiliate' in strategy:
+            bonus += np.where(columns.contains('affiliate'), 2.0, 0.0)
+        if 'ads' in strategy:
+            bonus += 1.5
+        if 'courses' in strategy:
+            bonus += np.where(columns.contains('course'), 2.5, 0.0)
+        bonus += np.where(columns.contains('high_value'), 1.5, 0.0)
+
+        return round_like_python(base_score + bonus, 2)
+
+    def competition_levels(self, columns: TrendColumns) -> np.ndarray:
+        """Vectorized TrendAnalyzer._analyze_competition"""
+
+        competition = 3.0 + np.where(columns.contains('competition'), 1.5, 0.0)
+        competition = competition + np.where(columns.urgent, 1.0, 0.0)
+
+        return np.minimum(competition, 5.0)
+
+    def top_opportunities(self, trends: Sequence[Dict], limit: int = 10) -> List[Dict]:
+        """
+        Score all trends and return the best `limit` as annotated copies, ranked like
+        TrendAnalyzer's stable descending sort (earlier trends win ties)
+        """
+
+        columns = TrendColumns(trends, self.keyword_index)
+        viral = self.viral_scores(columns)
+        monetization = self.monetization_potentials(columns)
+        competition = self.competition_levels(columns)
+
+        combined = viral + monetization - competition
+        selected = _top_indices(combined, limit)
+
+        opportunities = []
+        for index in selected:
+            trend = dict(trends[index])
+            trend['viral_score'] = float(viral[index])
+            trend['monetization_potential'] = float(monetization[index])
+            trend['competition_level'] = float(competition[index])
+            opportunities.append(trend)
+
+        return opportunities
+
+def _top_indices(keys: np.ndarray, limit: int) -> np.ndarray:
+    """Indices of the `limit` largest keys, largest first, ties in index order"""
+
+    if limit <= 0 or keys.size == 0:
+        return np.empty(0, dtype=np.intp)
+
+    if keys.size > limit:
+        # argpartition splits ties at the cut arbitrarily, so take everything strictly
+        # above the cut and fill up with the earliest trends equal to it
+        cut = keys[np.argpartition(-keys, limit - 1)[limit - 1]]
+        above = np.flatnonzero(keys > cut)
+        at_cut = np.flatnonzero(keys == cut)[:limit - above.size]
+        candidates = np.concatenate([above, at_cut])
+    else:
+        candidates = np.arange(keys.size)
+
+    # lexsort sorts by the last key first: descending score, then ascending index
+    order = np.lexsort((candidates, -keys[candidates]))
+    return candidates[order]
+
+# Benchmark and equivalence check against the per-dict scorers
+# Run from the repository root as a module: python -m trend_analysis.scoring_engine
+if __name__ == "__main__":
+    import random
+    import time
+
+    from trend_analysis.trend_analyzer import TrendAnalyzer
+
+    analyzer = TrendAnalyzer()
+    rng = random.Random(42)
+    words = ['best', 'review', 'guide', 'premium', 'viral', 'kids', 'tech review', 'gaming', 'how to',
+             'budget', 'top', 'business', 'tutorial', 'smartphone', 'fitness', 'learning', 'news']
+
+    def random_trend() -> Dict:
+        trend = {'topic': ' '.join(rng.choice(words).title() for _ in range(rng.randint(2, 5)))}
+        kind = rng.randrange(4)
+        if kind == 0:
+            trend.update(views=rng.randint(10000, 20000000), growth_rate=rng.randint(50, 300))
+        elif kind == 1:
+            trend.update(search_volume=rng.randint(10000, 2000000), growth_rate=rng.randint(50, 300))
+        elif kind == 2:
+            trend.update(avg_views=rng.randint(10000, 5000000), engagement_rate=round(rng.uniform(5, 25), 1))
+        else:
+            trend.update(seasonal_boost=1.5, urgency='high')
+        return trend
+
+    for channel_id, channel in analyzer.config['channels'].items():
+        trends = [random_trend() for _ in range(50000)]
+
+        start = time.perf_counter()
+        expected = []
+        for trend in trends:
+            scored = dict(trend)
+            scored['viral_score'] = analyzer._calculate_viral_score(scored, channel)
+            scored['monetization_potential'] = analyzer._calculate_monetization_potential(scored, channel)
+            scored['competition_level'] = analyzer._analyze_competition(scored)
+            expected.append(scored)
+        expected.sort(key=lambda x: x['viral_score'] + x['monetization_potential'] - x['competition_level'],
+                      reverse=True)
+        expected = expected[:10]
+        per_dict = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = ScoringEngine(channel).top_opportunities(trends)
+        vectorized = time.perf_counter() - start
+
+        print(f"{channel_id}: {len(trends)} trends, per-dict {per_dict * 1000:.0f} ms, "
+              f"vectorized {vectorized * 1000:.0f} ms, identical top 10: {actual == expected}")
@@ -0,0 +1,378 @@
+"""
+Snapshot Store - Append-only history of trend metrics
+
+This module:
+- Records every fetched trend as one row (timestamp, niche, topic, metrics) on local disk
+- Stores each column in its own flat binary file, appended to and never rewritten
+- Reads columns through memory maps, so millions of rows cost no load time
+- Indexes rows by topic for fast per-topic history lookups
+- Estimates growth rate and acceleration per topic with vectorized rolling windows
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl  # POSIX only; elsewhere appends are only serialized within the process
+except ImportError:
+    fcntl = None
+
+# Column name -> dtype; every column file holds exactly one value per row
+COLUMNS = {
+    'timestamp': np.float64,
+    'niche': np.int32,
+    'topic': np.int32,
+    'views': np.float64,
+    'search_volume': np.float64,
+    'avg_views': np.float64,
+    'engagement_rate': np.float64
+}
+
+# Metrics stored per row (NaN when a source doesn't report it)
+METRICS = ['views', 'search_volume', 'avg_views', 'engagement_rate']
+
+# Popularity measure for growth estimates: the first metric a row has, in this order
+POPULARITY_METRICS = ['views', 'search_volume', 'avg_views']
+
+class SnapshotStore:
+    def __init__(self, path: str = "data/trend_snapshots"):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._names: Dict[str, List[str]] = {'niche': [], 'topic': []}
+        self._ids: Dict[str, Dict[str, int]] = {'niche': {}, 'topic': {}}
+        self._name_file_sizes = {'niche': 0, 'topic': 0}
+
+        # Topic index: row numbers sorted by (topic, timestamp), valid for the first _indexed_rows rows,
+        # with the sorted keys kept alongside so appended rows can be merged in
+        self._order: Optional[np.ndarray] = None
+        self._sorted_topics: Optional[np.ndarray] = None
+        self._sorted_timestamps: Optional[np.ndarray] = None
+        self._segment_starts: Optional[np.ndarray] = None
+        self._indexed_rows = -1
+
+        with self._lock, self._file_lock():
+            self._repair()
+            self._load_names()
+
+    def _column_path(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _names_path(self, kind: str) -> str:
+        return os.path.join(self.path, f"{kind}s.jsonl")
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock shared with other processes appending to the same store"""
+        with open(os.path.join(self.path, '.lock'), 'a') as handle:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _column_rows(self) -> Dict[str, int]:
+        rows = {}
+        for name, dtype in COLUMNS.items():
+            try:
+                rows[name] = os.path.getsize(self._column_path(name)) // np.dtype(dtype).itemsize
+            except OSError:
+                rows[name] = 0
+        return rows
+
+    def _repair(self):
+        """Cut columns back to the last complete row (an append interrupted by a crash leaves them ragged)"""
+        rows = self._column_rows()
+        complete = min(rows.values())
+        for name, count in rows.items():
+            if count > complete:
+                with open(self._column_path(name), 'r+b') as f:
+                    f.truncate(complete * np.dtype(COLUMNS[name]).itemsize)
+
+    def _load_names(self):
+        """Pick up niches and topics added since the last look (also by other processes)"""
+        for kind in ('niche', 'topic'):
+            path = self._names_path(kind)
+            if not os.path.exists(path) or os.path.getsize(path) == self._name_file_sizes[kind]:
+                continue
+
+            with open(path, 'rb') as f:
+                f.seek(self._name_file_sizes[kind])
+                data = f.read()
+
+            # Ignore a trailing line another process is still writing
+            complete = data[:data.rfind(b'\n') + 1]
+            for line in complete.splitlines():
+                name = json.loads(line)
+                self._ids[kind][name] = len(self._names[kind])
+                self._names[kind].append(name)
+            self._name_file_sizes[kind] += len(complete)
+
+    def _intern(self, kind: str, names: List[str]) -> np.ndarray:
+        """Ids for names, registering new ones (caller holds both locks)"""
+
+        new = [name for name in dict.fromkeys(names) if name not in self._ids[kind]]
+        if new:
+            with open(self._names_path(kind), 'a', encoding='utf-8') as f:
+                for name in new:
+                    self._ids[kind][name] = len(self._names[kind])
+                    self._names[kind].append(name)
+                    f.write(json.dumps(name) + '\n')
+            self._name_file_sizes[kind] = os.path.getsize(self._names_path(kind))
+
+        return np.array([self._ids[kind][name] for name in names], dtype=np.int32)
+
+    def append(self, niche: str, trends: List[Dict], timestamp: Optional[float] = None) -> int:
+        """Record one fetch of a niche's trends; returns the number of rows written"""
+
+        if not trends:
+            return 0
+
+        timestamp = time.time() if timestamp is None else timestamp
+        count = len(trends)
+
+        with self._lock, self._file_lock():
+            self._repair()
+            self._load_names()
+
+            values = {
+                'timestamp': np.full(count, timestamp, dtype=np.float64),
+                'niche': self._intern('niche', [niche] * count),
+                'topic': self._intern('topic', [trend['topic'] for trend in trends])
+            }
+            for metric in METRICS:
+                values[metric] = np.array([trend.get(metric, np.nan) for trend in trends], dtype=np.float64)
+
+            for name, dtype in COLUMNS.items():
+                with open(self._column_path(name), 'ab') as f:
+                    f.write(values[name].astype(dtype, copy=False).tobytes())
+
+        return count
+
+    def __len__(self) -> int:
+        return min(self._column_rows().values())
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Read-only memory maps of every column, cut to the complete rows"""
+
+        rows = len(self)
+        if rows == 0:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+        return {
+            name: np.memmap(self._column_path(name), dtype=dtype, mode='r', shape=(rows,))
+            for name, dtype in COLUMNS.items()
+        }
+
+    def _topic_index(self, columns: Dict[str, np.ndarray]):
+        """Row order sorted by (topic, timestamp) and where each topic's rows start in it"""
+
+        rows = len(columns['topic'])
+        if rows == self._indexed_rows:
+            return self._order, self._segment_starts
+
+        if self._order is None or rows < self._indexed_rows:
+            # Sorted on time within each topic too, in case older snapshots were backfilled later
+            self._order = np.lexsort((columns['timestamp'], columns['topic']))
+            self._sorted_topics = np.asarray(columns['topic'][self._order])
+            self._sorted_timestamps = np.asarray(columns['timestamp'][self._order])
+        else:
+            self._merge_new_rows(columns, rows)
+
+        self._segment_starts = np.flatnonzero(np.diff(self._sorted_topics, prepend=-1))
+        self._indexed_rows = rows
+
+        return self._order, self._segment_starts
+
+    def _merge_new_rows(self, columns: Dict[str, np.ndarray], rows: int):
+        """Merge rows appended since the index was built into it, without sorting the old rows again"""
+
+        new_rows = np.arange(self._indexed_rows, rows)
+        new_topics = np.asarray(columns['topic'][self._indexed_rows:rows])
+        new_timestamps = np.asarray(columns['timestamp'][self._indexed_rows:rows])
+
+        # Sorting only the new rows is cheap; lexsort is stable, so equal keys stay in row order
+        new_order = np.lexsort((new_timestamps, new_topics))
+        new_rows, new_topics, new_timestamps = new_rows[new_order], new_topics[new_order], new_timestamps[new_order]
+
+        # Each new row goes after the indexed rows of its topic with an equal or earlier timestamp:
+        # the end of its topic's segment, unless it was backfilled before the segment's latest row
+        segment_lo = np.searchsorted(self._sorted_topics, new_topics, side='left')
+        positions = np.searchsorted(self._sorted_topics, new_topics, side='right')
+
+        latest = self._sorted_timestamps[np.maximum(positions - 1, 0)]
+        for index in np.flatnonzero((positions > segment_lo) & (new_timestamps < latest)):
+            lo, hi = segment_lo[index], positions[index]
+            positions[index] = lo + np.searchsorted(self._sorted_timestamps[lo:hi], new_timestamps[index], side='right')
+
+        self._order = np.insert(self._order, positions, new_rows)
+        self._sorted_topics = np.insert(self._sorted_topics, positions, new_topics)
+        self._sorted_timestamps = np.insert(self._sorted_timestamps, positions, new_timestamps)
+
+    def topic_id(self, topic: str) -> Optional[int]:
+        with self._lock:
+            self._load_names()
+            return self._ids['topic'].get(topic)
+
+    def history(self, topic: str) -> Dict[str, np.ndarray]:
+        """All recorded rows of a topic in time order, column by column"""
+
+        topic_id = self.topic_id(topic)
+        columns = self.columns()
+
+        if topic_id is None or len(columns['topic']) == 0:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+        with self._lock:
+            order, starts = self._topic_index(columns)
+
+        sorted_topics = columns['topic'][order[starts]]
+        position = np.searchsorted(sorted_topics, topic_id)
+        if position >= len(starts) or sorted_topics[position] != topic_id:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+        end = starts[position + 1] if position + 1 < len(starts) else len(order)
+        rows = order[starts[position]:end]
+
+        return {name: np.asarray(column[rows]) for name, column in columns.items()}
+
+    def growth(self, niche: Optional[str] = None, window_hours: float = 24.0,
+               now: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Measured growth per topic: {topic: {'growth_rate', 'acceleration', 'samples', 'popularity'}}
+        growth_rate: % change of popularity over the last window (views, else search volume, else average views)
+        acceleration: growth_rate minus the growth rate over the window before it (None without enough history)
+        Topics without a sample at least one window old are left out
+        """
+
+        columns = self.columns()
+        if len(columns['topic']) == 0:
+            return {}
+
+        with self._lock:
+            self._load_names()
+            order, _ = self._topic_index(columns)
+            niche_id = self._ids['niche'].get(niche) if niche is not None else None
+
+        if niche is not None and niche_id is None:
+            return {}
+
+        window = window_hours * 3600
+        now = time.time() if now is None else now
+
+        # Rows in (topic, time) order, restricted to the niche and to rows that have a popularity value
+        topics = columns['topic'][order]
+        timestamps = columns['timestamp'][order]
+        popularity = np.full(len(order), np.nan)
+        for metric in reversed(POPULARITY_METRICS):
+            values = columns[metric][order]
+            popularity = np.where(np.isnan(values), popularity, values)
+
+        keep = ~np.isnan(popularity) & (timestamps <= now)
+        if niche_id is not None:
+            keep &= columns['niche'][order] == niche_id
+
+        topics, timestamps, popularity = topics[keep], timestamps[keep], popularity[keep]
+        if len(topics) == 0:
+            return {}
+
+        # Last row of every topic is its current value
+        last = np.flatnonzero(np.append(np.diff(topics) != 0, True))
+        first = np.concatenate(([0], last[:-1] + 1))
+
+        # Composite (topic, second) keys are sorted, so one searchsorted finds every topic's past samples
+        keys = (topics.astype(np.int64) << 32) | timestamps.astype(np.int64)
+        def value_before(offset: float) -> np.ndarray:
+            targets = (topics[last].astype(np.int64) << 32) | (timestamps[last] - offset).astype(np.int64)
+            found = np.searchsorted(keys, targets, side='right') - 1
+            return np.where(found >= first, found, -1)
+
+        previous = value_before(window)
+        earlier = value_before(2 * window)
+
+        current = popularity[last]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = (current - popularity[previous]) / popularity[previous] * 100
+            prior_growth = (popularity[previous] - popularity[earlier]) / popularity[earlier] * 100
+
+        has_growth = (previous >= 0) & np.isfinite(growth)
+        has_acceleration = has_growth & (earlier >= 0) & np.isfinite(prior_growth)
+        samples = last - first + 1
+
+        with self._lock:
+            names = self._names['topic']
+
+        results = {}
+        for position in np.flatnonzero(has_growth):
+            results[names[topics[last[position]]]] = {
+                'growth_rate': round(float(growth[position]), 2),
+                'acceleration': (round(float(growth[position] - prior_growth[position]), 2)
+                                 if has_acceleration[position] else None),
+                'samples': int(samples[position]),
+                'popularity': float(current[position])
+            }
+
+        return results
+
+# Benchmark: append and analyze a few million rows
+if __name__ == "__main__":
+    import random
+    import shutil
+    import sys
+    import tempfile
+
+    rows_target = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    topics_per_niche = 2000
+    niches = ['technology', 'education_kids', 'lifestyle', 'gaming', 'health', 'motivation']
+
+    directory = tempfile.mkdtemp(prefix='trend_snapshots_')
+    try:
+        store = SnapshotStore(directory)
+        rng = random.Random(1)
+        base = {(niche, i): rng.uniform(1e4, 5e6) for niche in niches for i in range(topics_per_niche)}
+        rate = {key: rng.uniform(-0.02, 0.08) for key in base}
+
+        start = time.perf_counter()
+        fetches = rows_target // (len(niches) * topics_per_niche)
+        t0 = time.time() - fetches * 6 * 3600
+        for fetch in range(fetches):
+            for niche in niches:
+                store.append(niche, [
+                    {'topic': f"{niche} topic {i}", 'views': base[niche, i] * (1 + rate[niche, i]) ** fetch}
+                    for i in range(topics_per_niche)
+                ], timestamp=t0 + fetch * 6 * 3600)
+        appended = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reopened = SnapshotStore(directory)
+        rows = len(reopened)
+        opened = time.perf_counter() - start
+
+        start = time.perf_counter()
+        growth = reopened.growth(window_hours=24, now=t0 + fetches * 6 * 3600)
+        analyzed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        history = reopened.history('gaming topic 42')
+        looked_up = time.perf_counter() - start
+
+        print(f"{rows:,} rows ({fetches} fetches x {len(niches)} niches x {topics_per_niche} topics)")
+        print(f"Append:          {appended:.2f}s")
+        print(f"Open:            {opened * 1000:.1f} ms")
+        print(f"Growth (all):    {analyzed * 1000:.0f} ms for {len(growth):,} topics")
+        print(f"Topic history:   {looked_up * 1000:.1f} ms ({len(history['timestamp'])} rows)")
+
+        sample = growth['gaming topic 42']
+        expected = ((1 + rate['gaming', 42]) ** 4 - 1) * 100
+        print(f"gaming topic 42: measured {sample['growth_rate']}%/24h, expected {expected:.2f}%")
+    finally:
+        shutil.rmtree(directory)
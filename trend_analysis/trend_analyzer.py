@@ -10,12 +10,22 @@ This module analyzes:
 """
 
 import requests
+import asyncio
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import random
-from typing import Dict, List, Tuple
+import threading
+from typing import Awaitable, Dict, List, Optional, Tuple, Union
 import time
 
+import numpy as np
+
+from trend_analysis.scoring_engine import NICHE_MULTIPLIERS, ScoringEngine, scoring_keyword_index
+from trend_analysis.snapshot_store import COLUMNS, SnapshotStore
+from trend_analysis.trend_sources import CallableSource, TrendSource, fetch_trends, running_loop
+
 class TrendAnalyzer:
     def __init__(self, config_path: str = "config/channels_config.json"):
         with open(config_path, 'r') as f:
@@ -24,38 +34,217 @@ class TrendAnalyzer:
         # These would be your actual API keys (free tiers available)
         self.youtube_api_key = "YOUR_YOUTUBE_API_KEY"  # Free 10,000 requests/day
         self.trends_api_key = "YOUR_GOOGLE_TRENDS_KEY"  # Free tier available
+        
+        settings = self.config.get('global_settings', {})
+        
+        # Sources are queried concurrently; results of a source slower than its timeout are left out
+        source_timeout = settings.get('trend_source_timeout_seconds', 10)
+        self.trend_sources: List[TrendSource] = [
+            CallableSource('youtube', self._get_youtube_trending_topics, source_timeout),
+            CallableSource('google_trends', self._get_google_trending_topics, source_timeout),
+            CallableSource('competitors', self._analyze_competitor_content, source_timeout),
+            CallableSource('seasonal', self._get_seasonal_opportunities, source_timeout)
+        ]
+        
+        # Blocking sources share one capped pool for the analyzer's lifetime (created on first fetch),
+        # so HTTP sources keep their per-thread keep-alive sessions between fetches
+        self.trend_source_workers = max(1, settings.get('trend_source_workers', 16))
+        self._source_executor: Optional[ThreadPoolExecutor] = None
+        self._source_executor_lock = threading.Lock()
+        
+        # Every fetch is recorded so growth rates can be measured instead of taken from the sources
+        # (the store and its directory are only created by the first fetch)
+        self.trend_snapshot_dir = settings.get('trend_snapshot_dir', 'data/trend_snapshots')
+        self._snapshot_store: Optional[SnapshotStore] = None
+        self._snapshot_store_lock = threading.Lock()
+        self.growth_window_hours = settings.get('trend_growth_window_hours', 24)
+        self.use_measured_growth = settings.get('use_measured_growth', True)
+        
+        # Fetched trends per niche, reused for trending_check_frequency_hours (0 disables the cache)
+        ttl_hours = settings.get('trending_check_frequency_hours', 6)
+        self.trend_cache_ttl = ttl_hours * 3600
+        self._trend_cache: Dict[str, Tuple[float, List[Dict]]] = {}
+        self._trend_cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
     
-    def get_viral_opportunities(self, channel_id: str) -> List[Dict]:
+    def get_viral_opportunities(self, channel_id: str, force_refresh: bool = False) -> List[Dict]:
         """
         Get viral video opportunities for a specific channel
         Returns topics ranked by viral potential and monetization opportunity
+        force_refresh: query the sources even if the niche's cached trends are still fresh
         """
         channel = self.config['channels'][channel_id]
         niche = channel['niche']
         
-        opportunities = []
+        # Combine trending topics from multiple sources
+        all_trends = self._get_niche_trends(niche, force_refresh)
+        
+        # Score all trends at once and rank by viral potential + monetization - competition
+        # (same results as the per-dict _calculate_* scorers below)
+        return ScoringEngine(channel).top_opportunities(all_trends, limit=10)  # Return top 10 opportunities
+    
+    def _get_niche_trends(self, niche: str, force_refresh: bool = False) -> List[Dict]:
+        """All sources' trends for a niche, from the cache while it is fresh; always fresh copies"""
+        
+        now = time.monotonic()
+        
+        with self._trend_cache_lock:
+            cached = self._trend_cache.get(niche)
+            if cached and not force_refresh and now - cached[0] < self.trend_cache_ttl:
+                self.cache_hits += 1
+                # Callers annotate the dicts with scores; never hand out the cached ones
+                return [dict(trend) for trend in cached[1]]
+            self.cache_misses += 1
+        
+        all_trends = self._fetch_niche_trends([niche])[niche]
+        
+        return [dict(trend) for trend in all_trends]
+    
+    def _get_source_executor(self) -> ThreadPoolExecutor:
+        """Threads for the blocking trend sources"""
+        with self._source_executor_lock:
+            if self._source_executor is None:
+                self._source_executor = ThreadPoolExecutor(max_workers=self.trend_source_workers,
+                                                           thread_name_prefix='trend-source')
+            return self._source_executor
+    
+    def close(self):
+        """Stop the trend source threads (a later fetch starts new ones)"""
+        with self._source_executor_lock:
+            executor, self._source_executor = self._source_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+    
+    def _fetch_niche_trends(self, niches: List[str]) -> Dict[str, List[Dict]]:
+        """Query every source for every niche at once and cache the complete results"""
+        
+        if running_loop() is None:
+            return asyncio.run(self._fetch_niche_trends_async(niches))
+        
+        # A synchronous lookup from inside a coroutine can't re-enter the running loop, so the fetch
+        # gets a loop of its own on a helper thread (await prefetch_trends first to avoid blocking)
+        with ThreadPoolExecutor(max_workers=1) as runner:
+            return runner.submit(asyncio.run, self._fetch_niche_trends_async(niches)).result()
+    
+    async def _fetch_niche_trends_async(self, niches: List[str]) -> Dict[str, List[Dict]]:
+        fetched_at = time.monotonic()
+        executor = self._get_source_executor()
+        merged, failures = await fetch_trends(self.trend_sources, niches, executor)
+        
+        # Snapshot files are written on the pool, not on the event loop
+        await asyncio.get_running_loop().run_in_executor(
+            executor, self._store_fetched_trends, merged, failures, fetched_at
+        )
+        
+        return merged
+    
+    def _store_fetched_trends(self, merged: Dict[str, List[Dict]], failures: List[Dict], fetched_at: float):
+        """Record snapshots of a fetch and cache the niches every source answered for"""
+        
+        incomplete = set()
+        for failure in failures:
+            print(f"⚠️  Trend source {failure['source']} failed for {failure['niche']}: {failure['error']}")
+            incomplete.add(failure['niche'])
+        
+        for niche, trends in merged.items():
+            self._record_snapshot(niche, trends)
+        
+        with self._trend_cache_lock:
+            for niche, trends in merged.items():
+                # Partial results are used once but not cached, so the next call tries the slow source again
+                if niche not in incomplete:
+                    self._trend_cache[niche] = (fetched_at, [dict(trend) for trend in trends])
+    
+    def _record_snapshot(self, niche: str, trends: List[Dict]):
+        """Store this fetch and replace static growth rates with ones measured from the history"""
+        
+        try:
+            store = self._get_snapshot_store()
+            store.append(niche, trends)
+            measured = store.growth(niche, self.growth_window_hours) if self.use_measured_growth else {}
+        except (OSError, ValueError) as e:
+            # ValueError: a corrupt or mismatched column file; the sources' estimates still work
+            print(f"⚠️  Trend history unavailable: {e}")
+            return
+        
+        # Topics seen for less than a window keep the growth rate their source reported
+        for trend in trends:
+            if trend['topic'] in measured:
+                trend['growth_rate'] = measured[trend['topic']]['growth_rate']
+                trend['growth_acceleration'] = measured[trend['topic']]['acceleration']
+    
+    def get_growth_history(self, topic: str) -> Dict:
+        """Recorded snapshots of a topic (timestamps and metrics as arrays)"""
         
-        # Get trending topics from multiple sources
-        youtube_trends = self._get_youtube_trending_topics(niche)
-        google_trends = self._get_google_trending_topics(niche)
-        competitor_trends = self._analyze_competitor_content(niche)
-        seasonal_trends = self._get_seasonal_opportunities(niche)
+        if self._snapshot_store is None and not os.path.isdir(self.trend_snapshot_dir):
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
         
-        # Combine and rank opportunities
-        all_trends = youtube_trends + google_trends + competitor_trends + seasonal_trends
+        return self._get_snapshot_store().history(topic)
+    
+    def _get_snapshot_store(self) -> SnapshotStore:
+        """Trend history on disk, opened on first use"""
+        with self._snapshot_store_lock:
+            if self._snapshot_store is None:
+                self._snapshot_store = SnapshotStore(self.trend_snapshot_dir)
+            return self._snapshot_store
+    
+    def register_source(self, source: TrendSource):
+        """Add a trend source, replacing any existing source with the same name"""
+        self.trend_sources = [s for s in self.trend_sources if s.name != source.name] + [source]
+        self.clear_trend_cache()
+    
+    def prefetch_trends(self, niches: Optional[List[str]] = None,
+                        force_refresh: bool = False) -> Union[int, Awaitable[int]]:
+        """
+        Fetch all niches that aren't freshly cached in one concurrent round; returns how many were fetched
+        Called from a coroutine it can't block the running loop and returns an awaitable of that count
+        """
         
-        # Score each opportunity
-        for trend in all_trends:
-            score = self._calculate_viral_score(trend, channel)
-            trend['viral_score'] = score
-            trend['monetization_potential'] = self._calculate_monetization_potential(trend, channel)
-            trend['competition_level'] = self._analyze_competition(trend)
-            opportunities.append(trend)
+        prefetch = self.prefetch_trends_async(niches, force_refresh)
         
-        # Sort by combined score (viral potential + monetization - competition)
-        opportunities.sort(key=lambda x: x['viral_score'] + x['monetization_potential'] - x['competition_level'], reverse=True)
+        if running_loop() is None:
+            return asyncio.run(prefetch)
+        return asyncio.ensure_future(prefetch)
+    
+    async def prefetch_trends_async(self, niches: Optional[List[str]] = None, force_refresh: bool = False) -> int:
+        """prefetch_trends for coroutines"""
+        
+        if niches is None:
+            niches = sorted({channel['niche'] for channel in self.config['channels'].values()})
+        
+        now = time.monotonic()
+        with self._trend_cache_lock:
+            stale = [
+                niche for niche in niches
+                if force_refresh or niche not in self._trend_cache
+                or now - self._trend_cache[niche][0] >= self.trend_cache_ttl
+            ]
+        
+        if stale:
+            await self._fetch_niche_trends_async(stale)
         
-        return opportunities[:10]  # Return top 10 opportunities
+        return len(stale)
+    
+    def clear_trend_cache(self, niche: Optional[str] = None):
+        """Forget cached trends of one niche (or all of them)"""
+        with self._trend_cache_lock:
+            if niche is None:
+                self._trend_cache.clear()
+            else:
+                self._trend_cache.pop(niche, None)
+    
+    def cache_stats(self) -> Dict:
+        """Hit/miss counters of the trend cache"""
+        with self._trend_cache_lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'hit_rate': round(self.cache_hits / lookups, 3) if lookups else 0.0,
+                'cached_niches': sorted(self._trend_cache),
+                'ttl_seconds': self.trend_cache_ttl
+            }
     
     def _get_youtube_trending_topics(self, niche: str) -> List[Dict]:
         """Get trending topics from YouTube API"""
@@ -214,7 +403,8 @@ class TrendAnalyzer:
             score += min(trend['search_volume'] / 100000, 10)  # Search volume, max 10 points
         
         # Niche alignment bonus
-        if any(keyword in trend['topic'].lower() for keyword in channel['keywords']):
+        index = scoring_keyword_index(tuple(channel['keywords']))
+        if index.has(index.classify(trend['topic'].lower()), 'channel'):
             score += 5
         
         # Engagement bonus
@@ -238,30 +428,24 @@ class TrendAnalyzer:
         strategy = channel['monetization_strategy']
         
         # Base monetization potential by niche
-        niche_multipliers = {
-            'technology': 3.5,  # High-value ads, affiliate potential
-            'health': 3.0,     # High-paying health ads
-            'lifestyle': 2.5,  # Good affiliate opportunities
-            'gaming': 2.0,     # Gaming ads, sponsorships
-            'motivation': 2.8, # Course/book sales potential
-            'education_kids': 2.2  # Educational product sales
-        }
+        base_score = NICHE_MULTIPLIERS.get(channel['niche'], 2.0)
         
-        base_score = niche_multipliers.get(channel['niche'], 2.0)
+        # Every keyword class of the topic, found in one scan
+        index = scoring_keyword_index()
+        keywords = index.classify(trend['topic'].lower())
         
         # Strategy-specific bonuses
-        if 'affiliate' in strategy and any(word in trend['topic'].lower() for word in ['review', 'best', 'tool', 'product']):
+        if 'affiliate' in strategy and index.has(keywords, 'affiliate'):
             monetization_score += 2
         
         if 'ads' in strategy:
             monetization_score += 1.5
         
-        if 'courses' in strategy and any(word in trend['topic'].lower() for word in ['how to', 'guide', 'tutorial']):
+        if 'courses' in strategy and index.has(keywords, 'course'):
             monetization_score += 2.5
         
         # Topic-specific monetization potential
-        high_value_keywords = ['expensive', 'premium', 'professional', 'business', 'investment']
-        if any(keyword in trend['topic'].lower() for keyword in high_value_keywords):
+        if index.has(keywords, 'high_value'):
             monetization_score += 1.5
         
         return round(base_score + monetization_score, 2)
@@ -275,11 +459,10 @@ class TrendAnalyzer:
         # - Average views of competing videos
         # - Channel sizes of competitors
         
-        competition_keywords = ['viral', 'trending', 'popular', 'best', 'top']
-        
         base_competition = 3.0  # Medium competition
         
-        if any(keyword in trend['topic'].lower() for keyword in competition_keywords):
+        index = scoring_keyword_index()
+        if index.has(index.classify(trend['topic'].lower()), 'competition'):
             base_competition += 1.5  # Higher competition for viral keywords
         
         # Recent topics have higher competition
@@ -0,0 +1,213 @@
+"""
+Trend Sources - Concurrent, pluggable fetching of trending topics
+
+This module:
+- Defines the interface every trend source implements (one fetch per niche)
+- Wraps the analyzer's built-in lookups and JSON HTTP endpoints as sources
+- Fetches all sources for all niches at once, each under its own timeout
+- Merges whatever arrived in time, in source order, and reports what didn't
+- Ships a local fixture server and a benchmark for working offline
+"""
+
+import asyncio
+import contextvars
+import json
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+import requests
+
+# Threads for blocking sources during a fetch_trends call (None = the loop's default executor)
+_source_executor = contextvars.ContextVar('trend_source_executor', default=None)
+
+async def run_blocking(func: Callable, *args):
+    """Run a blocking call on the current fetch's threads"""
+    return await asyncio.get_running_loop().run_in_executor(_source_executor.get(), func, *args)
+
+class TrendSource:
+    """A provider of trending topics; subclasses implement fetch()"""
+
+    def __init__(self, name: str, timeout: float = 10.0):
+        self.name = name
+        self.timeout = timeout
+
+    async def fetch(self, niche: str) -> List[Dict]:
+        raise NotImplementedError
+
+class CallableSource(TrendSource):
+    """A blocking function niche -> trends, run on a worker thread"""
+
+    def __init__(self, name: str, func: Callable[[str], List[Dict]], timeout: float = 10.0):
+        super().__init__(name, timeout)
+        self.func = func
+
+    async def fetch(self, niche: str) -> List[Dict]:
+        return await run_blocking(self.func, niche)
+
+class HttpJsonSource(TrendSource):
+    """GET url_template.format(niche=...) returning a JSON list of trend dicts"""
+
+    def __init__(self, name: str, url_template: str, timeout: float = 10.0,
+                 headers: Optional[Dict[str, str]] = None):
+        super().__init__(name, timeout)
+        self.url_template = url_template
+        self.headers = headers or {}
+        self._local = threading.local()
+
+    def _get(self, niche: str) -> List[Dict]:
+        # One keep-alive session per worker thread
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+
+        response = session.get(self.url_template.format(niche=niche), headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch(self, niche: str) -> List[Dict]:
+        return await run_blocking(self._get, niche)
+
+async def _fetch_one(source: TrendSource, niche: str) -> Tuple[List[Dict], Optional[str]]:
+    """A source's trends for a niche, or ([], reason) if it failed or ran out of time"""
+    try:
+        trends = await asyncio.wait_for(source.fetch(niche), source.timeout)
+        return list(trends), None
+    except asyncio.TimeoutError:
+        return [], f"timed out after {source.timeout}s"
+    except Exception as e:
+        return [], str(e) or type(e).__name__
+
+async def fetch_trends(sources: List[TrendSource], niches: List[str],
+                       executor: Optional[Executor] = None) -> Tuple[Dict[str, List[Dict]], List[Dict]]:
+    """
+    Fetch every source for every niche concurrently
+    executor: long-lived threads for the blocking sources (None = the loop's default executor); reusing
+    it across calls keeps HttpJsonSource's per-thread keep-alive sessions alive
+    Returns ({niche: merged trends in source order}, [{'source', 'niche', 'error'} for each failed fetch])
+    """
+
+    token = _source_executor.set(executor)
+
+    pairs = [(niche, source) for niche in niches for source in sources]
+    try:
+        results = await asyncio.gather(*(_fetch_one(source, niche) for niche, source in pairs))
+    finally:
+        _source_executor.reset(token)
+
+    merged = {niche: [] for niche in niches}
+    failures = []
+
+    for (niche, source), (trends, error) in zip(pairs, results):
+        merged[niche].extend(trends)
+        if error is not None:
+            failures.append({'source': source.name, 'niche': niche, 'error': error})
+
+    return merged, failures
+
+def fetch_trends_blocking(sources: List[TrendSource], niches: List[str], executor: Optional[Executor] = None
+                          ) -> Union[Tuple[Dict[str, List[Dict]], List[Dict]], Awaitable]:
+    """
+    fetch_trends for synchronous callers
+    Called while an event loop runs in this thread (asyncio.run would raise), it returns
+    a Task of fetch_trends to await instead of the result
+    """
+
+    fetch = fetch_trends(sources, niches, executor)
+
+    if running_loop() is None:
+        return asyncio.run(fetch)
+    return asyncio.ensure_future(fetch)
+
+def running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """The event loop running in this thread, if any"""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+def run_fixture_server(fixtures: Dict[str, Dict[str, List[Dict]]], delays: Optional[Dict[str, float]] = None,
+                       port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Serve fixtures[source][niche] as JSON at /<source>/<niche>, optionally delaying sources by delays[source] seconds
+    Returns the running server and its base URL; call server.shutdown() when done
+    """
+
+    delays = delays or {}
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = self.path.strip('/').split('/')
+            if len(parts) != 2 or parts[0] not in fixtures:
+                self.send_error(404)
+                return
+
+            source, niche = parts
+            time.sleep(delays.get(source, 0))
+
+            body = json.dumps(fixtures[source].get(niche, [])).encode('utf-8')
+            try:
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client timed out and hung up while we were "slow"
+                pass
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), FixtureHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+# Benchmark: sequential vs concurrent fetching against the fixture server
+if __name__ == "__main__":
+    import os
+    import sys
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from trend_analysis.trend_analyzer import TrendAnalyzer
+
+    analyzer = TrendAnalyzer()
+    niches = sorted({channel['niche'] for channel in analyzer.config['channels'].values()})
+
+    # Replay the built-in data with realistic API latencies; the competitor source is too slow
+    fixtures = {
+        source.name: {niche: source.func(niche) for niche in niches}
+        for source in analyzer.trend_sources
+    }
+    delays = {'youtube': 0.3, 'google_trends': 0.5, 'competitors': 2.0, 'seasonal': 0.05}
+    server, base_url = run_fixture_server(fixtures, delays)
+
+    sources = [
+        HttpJsonSource(name, f"{base_url}/{name}/{{niche}}", timeout=1.0 if name == 'competitors' else 5.0)
+        for name in fixtures
+    ]
+
+    start = time.perf_counter()
+    for niche in niches:
+        for source in sources:
+            try:
+                source._get(niche)
+            except requests.RequestException:
+                pass
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(sources) * len(niches), thread_name_prefix='trend-source') as executor:
+        merged, failures = fetch_trends_blocking(sources, niches, executor)
+        concurrent = time.perf_counter() - start
+
+    print(f"{len(sources)} sources x {len(niches)} niches")
+    print(f"Sequential: {sequential:.2f}s")
+    print(f"Concurrent: {concurrent:.2f}s ({sum(len(t) for t in merged.values())} trends, "
+          f"{len(failures)} fetches timed out)")
+
+    server.shutdown()
@@ -0,0 +1,228 @@
+"""
+Async Upload Manager - Concurrent uploads across many channels
+
+This module:
+- Keeps one authenticated upload client per channel
+- Runs uploads for different channels at the same time under a global concurrency limit
+- Caps the bandwidth of every channel with a token bucket
+- Reports progress through callbacks instead of printing
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Callable, Dict, List, Optional, Tuple
+
+from google.auth.transport.requests import AuthorizedSession
+
+from uploading.chunked_uploader import CHUNK_GRANULARITY, ChunkedUploader
+from uploading.youtube_automator import VIDEO_UPLOAD_URL, YouTubeAutomator
+
+class TokenBucket:
+    def __init__(self, rate_bytes_per_second: float, burst_bytes: Optional[float] = None):
+        """Allows rate bytes per second on average and bursts of up to burst_bytes"""
+        self.rate = rate_bytes_per_second
+        self.capacity = burst_bytes or rate_bytes_per_second
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: int):
+        """Take amount bytes from the bucket, sleeping while it is in debt"""
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Chunks larger than the bucket go into debt and wait it off
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+
+class AsyncUploadManager:
+    def __init__(self, automator: YouTubeAutomator, max_concurrent_uploads: Optional[int] = None,
+                 channel_bandwidth_mbps: Optional[float] = None,
+                 progress_callback: Optional[Callable[[Dict], None]] = None):
+        """
+        automator: supplies credentials, metadata optimization and analytics tracking
+        max_concurrent_uploads: uploads in flight across all channels (defaults to global_settings.upload_concurrency)
+        channel_bandwidth_mbps: per-channel cap in megabits per second, 0/None = unlimited
+        (defaults to global_settings.channel_upload_mbps; channels may override it with upload_mbps)
+        progress_callback: called on the event loop with event dicts:
+        {'channel_id', 'title', 'event': 'started' | 'progress' | 'completed' | 'failed', 'sent', 'total', ...}
+        """
+        self.automator = automator
+        self.config = automator.config
+
+        settings = self.config.get('global_settings', {})
+        self.max_concurrent_uploads = max_concurrent_uploads or settings.get('upload_concurrency', 6)
+        self.channel_bandwidth_mbps = (channel_bandwidth_mbps if channel_bandwidth_mbps is not None
+                                       else settings.get('channel_upload_mbps', 0))
+        self.progress_callback = progress_callback
+
+        self._clients: Dict[str, Tuple[ChunkedUploader, Optional[TokenBucket]]] = {}
+        self._clients_lock = threading.Lock()
+
+    def _channel_rate(self, channel_id: str) -> float:
+        """Bandwidth cap of a channel in bytes per second (0 = unlimited)"""
+        channel_config = self.config['channels'][channel_id]
+        mbps = channel_config.get('upload_mbps', self.channel_bandwidth_mbps) or 0
+        return mbps * 1_000_000 / 8
+
+    def _client(self, channel_id: str) -> ChunkedUploader:
+        """The channel's own authenticated uploader, created on first use"""
+
+        with self._clients_lock:
+            if channel_id not in self._clients:
+                creds = self.automator.channel_credentials(channel_id)
+                if creds is None:
+                    raise RuntimeError(f"No YouTube credentials for {channel_id}")
+
+                rate = self._channel_rate(channel_id)
+                bucket = TokenBucket(rate) if rate else None
+
+                uploader = ChunkedUploader(
+                    AuthorizedSession(creds),
+                    state_dir=self.automator.upload_sessions_dir,
+                    initial_chunk_size=self.automator.streaming_chunk_size,
+                    # Keep chunks to ~10 s at the capped rate so the limit stays smooth
+                    max_chunk_size=max(CHUNK_GRANULARITY, int(rate * 10)) if rate else 128 * 1024 * 1024,
+                    max_retries=self.automator.upload_max_retries,
+                    throttle=bucket.consume if bucket else None
+                )
+                self._clients[channel_id] = (uploader, bucket)
+
+            return self._clients[channel_id][0]
+
+    async def upload(self, video_data: Dict, channel_id: str, semaphore: asyncio.Semaphore,
+                     executor: Optional[Executor] = None) -> Dict:
+        """
+        Optimize metadata, upload and track one video; failures come back as {'error': ...}
+        executor: threads for the blocking work (None = the loop's default executor)
+        """
+
+        loop = asyncio.get_running_loop()
+        channel_config = self.config['channels'][channel_id]
+        title = video_data.get('title')
+
+        def emit(event: Dict):
+            if self.progress_callback:
+                self.progress_callback(dict(event, channel_id=channel_id, title=title))
+
+        def emit_threadsafe(event: Dict):
+            loop.call_soon_threadsafe(emit, event)
+
+        async with semaphore:
+            try:
+                # Credential refresh and the quota database block, so they run in a thread too
+                uploader, resource = await loop.run_in_executor(executor, self._prepare_blocking,
+                                                                video_data, channel_id)
+
+                emit({'event': 'started', 'sent': 0, 'total': None})
+                started = time.perf_counter()
+
+                # The uploader blocks on HTTP, so it runs in a thread; its callback hops back to the loop
+                result = await loop.run_in_executor(executor, self._upload_blocking, uploader, video_data,
+                                                    resource, emit_threadsafe)
+            except Exception as e:
+                emit({'event': 'failed', 'error': str(e)})
+                return {'error': str(e)}
+
+        if result.get('id'):
+            await loop.run_in_executor(executor, self._finish_blocking, result, channel_id)
+
+        emit({'event': 'completed', 'video_id': result.get('id'),
+              'elapsed_seconds': round(time.perf_counter() - started, 2)})
+        return result
+
+    def _prepare_blocking(self, video_data: Dict, channel_id: str) -> Tuple[ChunkedUploader, Dict]:
+        """Thread body: the channel's uploader and the video resource, with the upload's quota paid"""
+
+        channel_config = self.config['channels'][channel_id]
+        metadata = self.automator._optimize_video_metadata(video_data, channel_config)
+        resource = self.automator._build_video_resource(metadata)
+        uploader = self._client(channel_id)
+
+        # Charged only once the upload is ready to go; raises QuotaExceeded when the
+        # channel's project can't afford another upload today
+        self.automator.quota.spend('videos.insert', self.automator._api_project(channel_config))
+
+        return uploader, resource
+
+    def _finish_blocking(self, result: Dict, channel_id: str):
+        """Thread body: post-upload calls (quota database) and analytics of a finished upload"""
+
+        self.automator._post_upload_optimization(result['id'], self.config['channels'][channel_id], channel_id)
+        self.automator._track_upload_analytics(result, channel_id)
+
+    @staticmethod
+    def _upload_blocking(uploader: ChunkedUploader, video_data: Dict, resource: Dict,
+                         emit: Callable[[Dict], None]) -> Dict:
+        """Thread body: one chunked upload with progress forwarded through emit"""
+
+        def on_progress(sent: int, total: int):
+            emit({'event': 'progress', 'sent': sent, 'total': total})
+
+        # Uploads of the same channel share the client but report progress separately
+        return uploader.upload(
+            video_data['video_path'], resource, VIDEO_UPLOAD_URL,
+            params={'part': 'snippet,status'}, mimetype='video/mp4',
+            progress_callback=on_progress
+        )
+
+    async def upload_all(self, uploads: List[Tuple[str, Dict]]) -> List[Dict]:
+        """Upload (channel_id, video_data) pairs concurrently; results in input order"""
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_uploads)
+        loop = asyncio.get_running_loop()
+
+        # Our own threads, so the caller's loop keeps its default executor: one per upload the
+        # semaphore lets through, plus room for the bookkeeping of uploads that just finished
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrent_uploads * 2, thread_name_prefix='upload')
+
+        # Post-upload calls of the whole run are sent in batches once every upload is done
+        post_upload = ExitStack()
+        post_upload.enter_context(self.automator.batched_post_upload())
+
+        try:
+            return await asyncio.gather(*(
+                self.upload(video_data, channel_id, semaphore, executor) for channel_id, video_data in uploads
+            ))
+        finally:
+            # Flushing the batch is HTTP as well
+            await loop.run_in_executor(executor, post_upload.close)
+            executor.shutdown(wait=False)
+
+    def run(self, uploads: List[Tuple[str, Dict]]) -> List[Dict]:
+        """Blocking entry point for synchronous callers"""
+        return asyncio.run(self.upload_all(uploads))
+
+# Example usage
+if __name__ == "__main__":
+    automator = YouTubeAutomator()
+
+    def show_progress(event: Dict):
+        if event['event'] == 'progress':
+            print(f"[{event['channel_id']}] {event['sent'] * 100 // event['total']}% {event['title']}")
+        else:
+            print(f"[{event['channel_id']}] {event['event']}: {event['title']}")
+
+    manager = AsyncUploadManager(automator, progress_callback=show_progress)
+
+    uploads = [
+        (channel_id, {
+            'video_path': f'output/{channel_id}_sample_final.mp4',
+            'title': f"Sample video for {channel_config['name']}",
+            'description': 'Sample upload',
+            'tags': ['sample']
+        })
+        for channel_id, channel_config in automator.config['channels'].items()
+    ]
+
+    for (channel_id, _), result in zip(uploads, manager.run(uploads)):
+        print(f"{channel_id}: {result.get('id') or result.get('error')}")
@@ -0,0 +1,397 @@
+"""
+Chunked Uploader - Bounded-memory resumable uploads for large videos
+
+This module:
+- Speaks the YouTube resumable upload protocol one chunk at a time
+- Sizes chunks from the measured throughput (always multiples of 256 KiB)
+- Persists upload sessions to disk so a crash or restart resumes at the server's offset
+- Retries transient failures with exponential backoff plus full jitter
+"""
+
+import hashlib
+import json
+import os
+import random
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+
+# Every chunk except the last must be a multiple of this
+CHUNK_GRANULARITY = 256 * 1024
+
+# Statuses worth retrying; anything else in the 4xx range is a real rejection
+RETRIABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# Resumable sessions stay valid for about a week; don't try to reuse older ones
+SESSION_MAX_AGE_SECONDS = 6 * 24 * 3600
+
+class UploadError(Exception):
+    """The upload was rejected or ran out of retries"""
+
+class SessionExpired(UploadError):
+    """The server no longer knows the upload session"""
+
+class ChunkedUploader:
+    def __init__(self, session: requests.Session, state_dir: str = "data/upload_sessions",
+                 initial_chunk_size: int = 8 * 1024 * 1024, min_chunk_size: int = CHUNK_GRANULARITY,
+                 max_chunk_size: int = 128 * 1024 * 1024, target_chunk_seconds: float = 10.0,
+                 max_retries: int = 8, base_delay: float = 1.0, max_delay: float = 64.0,
+                 timeout: float = 120.0,
+                 progress_callback: Optional[Callable[[int, int], None]] = None,
+                 throttle: Optional[Callable[[int], None]] = None):
+        """
+        session: requests session that authenticates the calls (google AuthorizedSession in production)
+        target_chunk_seconds: chunks are resized so one takes about this long to send
+        max_retries: consecutive failures tolerated before giving up
+        progress_callback: called as progress_callback(bytes_sent, total_bytes) after every chunk
+        throttle: called with the size of every chunk before it is sent; may block to limit bandwidth
+        """
+        self.session = session
+        self.state_dir = state_dir
+        self.min_chunk_size = self._align(min_chunk_size)
+        self.max_chunk_size = max(self.min_chunk_size, self._align(max_chunk_size))
+        # Starting size of every upload; each upload adapts its own copy, so concurrent uploads don't interfere
+        self.chunk_size = min(max(self._align(initial_chunk_size), self.min_chunk_size), self.max_chunk_size)
+        self.target_chunk_seconds = target_chunk_seconds
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.progress_callback = progress_callback
+        self.throttle = throttle
+
+        os.makedirs(self.state_dir, exist_ok=True)
+
+    @staticmethod
+    def _align(size: int) -> int:
+        return max(CHUNK_GRANULARITY, int(size) // CHUNK_GRANULARITY * CHUNK_GRANULARITY)
+
+    def upload(self, path: str, metadata: Dict, upload_url: str, params: Optional[Dict] = None,
+               mimetype: str = 'video/mp4',
+               progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict:
+        """
+        Upload path with the given resource metadata and return the server's JSON response
+        Picks up a persisted session for the same file and metadata when one exists
+        progress_callback overrides the uploader's own for this upload
+        """
+
+        report = progress_callback or self.progress_callback
+
+        total = os.path.getsize(path)
+        state_path = self._state_path(path, total, metadata)
+        state = self._load_state(state_path)
+
+        offset = None
+        if state:
+            try:
+                offset, response = self._query_offset(state['session_uri'], total)
+                if response is not None:
+                    self._remove_state(state_path)
+                    return response
+                print(f"♻️ Resuming upload of {os.path.basename(path)} at {offset}/{total} bytes")
+            except SessionExpired:
+                state = None
+
+        # A session that expires mid-upload is replaced by a fresh one once; a second expiry is an error
+        for restarted in (False, True):
+            if state is None:
+                state = {
+                    'session_uri': self._start_session(upload_url, params, metadata, total, mimetype),
+                    'path': os.path.abspath(path),
+                    'size': total,
+                    'created': time.time(),
+                    'offset': 0
+                }
+                self._save_state(state_path, state)
+                offset = 0
+
+            try:
+                response = self._send_chunks(path, state, state_path, offset, total, mimetype, report)
+            except SessionExpired:
+                self._remove_state(state_path)
+                if restarted:
+                    raise
+                state = None
+                continue
+
+            self._remove_state(state_path)
+            return response
+
+    def _start_session(self, upload_url: str, params: Optional[Dict], metadata: Dict,
+                       total: int, mimetype: str) -> str:
+        """Open a resumable session and return its URI"""
+
+        query = dict(params or {}, uploadType='resumable')
+        headers = {
+            'Content-Type': 'application/json; charset=UTF-8',
+            'X-Upload-Content-Length': str(total),
+            'X-Upload-Content-Type': mimetype
+        }
+
+        response = self._with_retries(
+            lambda: self.session.post(upload_url, params=query, data=json.dumps(metadata),
+                                      headers=headers, timeout=self.timeout),
+            "start upload session"
+        )
+
+        if response.status_code != 200 or 'Location' not in response.headers:
+            raise UploadError(f"Could not start upload session: {response.status_code} {response.text[:200]}")
+
+        return response.headers['Location']
+
+    def _query_offset(self, session_uri: str, total: int):
+        """Ask the server how much it has; returns (offset, final response or None)"""
+
+        response = self._with_retries(
+            lambda: self.session.put(session_uri, headers={'Content-Range': f"bytes */{total}",
+                                                           'Content-Length': '0'}, timeout=self.timeout),
+            "query upload offset"
+        )
+
+        if response.status_code in (200, 201):
+            return total, response.json()
+        if response.status_code == 308:
+            return self._offset_from(response), None
+        if response.status_code in (404, 410):
+            raise SessionExpired(f"Upload session expired ({response.status_code})")
+
+        raise UploadError(f"Unexpected status querying upload: {response.status_code} {response.text[:200]}")
+
+    @staticmethod
+    def _offset_from(response: requests.Response) -> int:
+        """Next byte the server expects, from the Range header of a 308"""
+        received = response.headers.get('Range')
+        if not received:
+            return 0
+        return int(received.rsplit('-', 1)[1]) + 1
+
+    def _send_chunks(self, path: str, state: Dict, state_path: str, offset: int, total: int,
+                     mimetype: str, report: Optional[Callable[[int, int], None]]) -> Dict:
+        """PUT the file chunk by chunk from offset until the server returns the created resource"""
+
+        failures = 0
+        chunk_size = self.chunk_size
+
+        with open(path, 'rb') as f:
+            while True:
+                size = min(chunk_size, total - offset)
+                f.seek(offset)
+                chunk = f.read(size)
+
+                if self.throttle:
+                    self.throttle(len(chunk))
+
+                last_byte = offset + len(chunk) - 1
+                headers = {'Content-Type': mimetype, 'Content-Length': str(len(chunk))}
+                if chunk:
+                    headers['Content-Range'] = f"bytes {offset}-{last_byte}/{total}"
+                else:
+                    headers['Content-Range'] = f"bytes */{total}"
+
+                started = time.perf_counter()
+                try:
+                    response = self.session.put(state['session_uri'], data=chunk, headers=headers,
+                                                timeout=self.timeout)
+                    error = None if response.status_code not in RETRIABLE_STATUSES else \
+                        f"HTTP {response.status_code}"
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    response, error = None, str(e)
+
+                if error:
+                    failures += 1
+                    if failures > self.max_retries:
+                        raise UploadError(f"Upload failed after {self.max_retries} retries: {error}")
+
+                    # Smaller chunks are less likely to hit the same failure again
+                    chunk_size = max(self.min_chunk_size, self._align(chunk_size // 2))
+                    self._backoff(failures, error)
+
+                    # The server may have kept part of the chunk
+                    offset, done = self._query_offset(state['session_uri'], total)
+                    if done is not None:
+                        return done
+                    continue
+
+                failures = 0
+
+                if response.status_code in (200, 201):
+                    if report:
+                        report(total, total)
+                    return response.json()
+                if response.status_code in (404, 410):
+                    raise SessionExpired(f"Upload session expired ({response.status_code})")
+                if response.status_code != 308:
+                    raise UploadError(f"Upload rejected: {response.status_code} {response.text[:200]}")
+
+                acknowledged = self._offset_from(response)
+                chunk_size = self._adapt_chunk_size(chunk_size, acknowledged - offset, time.perf_counter() - started)
+                offset = acknowledged
+
+                state['offset'] = offset
+                self._save_state(state_path, state)
+                if report:
+                    report(offset, total)
+
+    def _adapt_chunk_size(self, chunk_size: int, sent_bytes: int, elapsed: float) -> int:
+        """Chunk size that takes about target_chunk_seconds at the measured throughput"""
+
+        if sent_bytes <= 0 or elapsed <= 0:
+            return chunk_size
+
+        throughput = sent_bytes / elapsed
+        wanted = self._align(throughput * self.target_chunk_seconds)
+
+        # Grow at most 2x per chunk so one fast chunk doesn't overshoot
+        wanted = min(wanted, chunk_size * 2)
+        return min(max(wanted, self.min_chunk_size), self.max_chunk_size)
+
+    def _backoff(self, attempt: int, reason: str):
+        """Sleep for a random time up to base_delay * 2^attempt (full jitter)"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        print(f"⚠️  Upload retry {attempt}/{self.max_retries} in {delay:.1f}s ({reason})")
+        time.sleep(delay)
+
+    def _with_retries(self, send: Callable[[], requests.Response], action: str) -> requests.Response:
+        """Run a small control request, retrying transient failures"""
+
+        for attempt in range(1, self.max_retries + 2):
+            try:
+                response = send()
+                if response.status_code not in RETRIABLE_STATUSES:
+                    return response
+                reason = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                reason = str(e)
+
+            if attempt > self.max_retries:
+                raise UploadError(f"Could not {action} after {self.max_retries} retries: {reason}")
+            self._backoff(attempt, reason)
+
+    # Session persistence
+
+    def _state_path(self, path: str, total: int, metadata: Dict) -> str:
+        """One state file per (file, size, mtime, metadata), so edited files never resume stale sessions"""
+
+        identity = json.dumps({
+            'path': os.path.abspath(path),
+            'size': total,
+            'mtime': os.path.getmtime(path),
+            'metadata': metadata
+        }, sort_keys=True, default=str)
+
+        return os.path.join(self.state_dir, hashlib.sha256(identity.encode('utf-8')).hexdigest() + ".json")
+
+    def _load_state(self, state_path: str) -> Optional[Dict]:
+        try:
+            with open(state_path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - state.get('created', 0) > SESSION_MAX_AGE_SECONDS:
+            self._remove_state(state_path)
+            return None
+
+        return state
+
+    def _save_state(self, state_path: str, state: Dict):
+        # Write-then-rename so a crash never leaves a half-written state file
+        temp_path = f"{state_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_path, state_path)
+
+    def _remove_state(self, state_path: str):
+        try:
+            os.remove(state_path)
+        except OSError:
+            pass
+
+def _run_fake_endpoint(failure_rate: float = 0.2):
+    """Local stand-in for the YouTube upload endpoint that randomly fails requests"""
+
+    import threading
+    import uuid
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    sessions = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, headers=None, body=b''):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            session_id = uuid.uuid4().hex
+            sessions[session_id] = {'total': int(self.headers['X-Upload-Content-Length']), 'data': bytearray()}
+            self._reply(200, {'Location': f"http://{self.headers['Host']}/session/{session_id}"})
+
+        def do_PUT(self):
+            session = sessions.get(self.path.rsplit('/', 1)[1])
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if session is None:
+                return self._reply(404)
+
+            content_range = self.headers.get('Content-Range', '')
+            if body and random.random() < failure_rate:
+                # Keep a random part of the chunk before "crashing", like a dropped connection
+                if content_range.startswith('bytes ') and '*' not in content_range.split('/')[0]:
+                    start = int(content_range[6:].split('-')[0])
+                    if start == len(session['data']):
+                        kept = random.randrange(len(body) + 1) // CHUNK_GRANULARITY * CHUNK_GRANULARITY
+                        session['data'] += body[:kept]
+                return self._reply(503)
+
+            if body:
+                start = int(content_range[6:].split('-')[0])
+                if start == len(session['data']):
+                    session['data'] += body
+
+            received = len(session['data'])
+            if received == session['total']:
+                digest = hashlib.sha256(bytes(session['data'])).hexdigest()
+                return self._reply(200, {'Content-Type': 'application/json'},
+                                   json.dumps({'id': 'fake-video', 'sha256': digest}).encode())
+
+            headers = {'Range': f"bytes=0-{received - 1}"} if received else {}
+            self._reply(308, headers)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# Example usage: upload a random file through a flaky local endpoint
+if __name__ == "__main__":
+    import tempfile
+
+    server = _run_fake_endpoint(failure_rate=0.2)
+    upload_url = f"http://127.0.0.1:{server.server_address[1]}/upload/youtube/v3/videos"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        video_path = os.path.join(workdir, "video.mp4")
+        with open(video_path, 'wb') as f:
+            f.write(os.urandom(12 * 1024 * 1024 + 12345))
+
+        uploader = ChunkedUploader(
+            requests.Session(), state_dir=os.path.join(workdir, "sessions"),
+            initial_chunk_size=CHUNK_GRANULARITY, base_delay=0.05, max_delay=0.5,
+            progress_callback=lambda sent, total: print(f"Upload progress: {sent * 100 // total}%")
+        )
+
+        result = uploader.upload(video_path, {'snippet': {'title': 'Test'}}, upload_url, {'part': 'snippet'})
+
+        with open(video_path, 'rb') as f:
+            expected = hashlib.sha256(f.read()).hexdigest()
+
+        print(f"✅ Uploaded {result['id']}, checksum {'matches' if result['sha256'] == expected else 'MISMATCH'}")
+
+    server.shutdown()
@@ -0,0 +1,128 @@
+"""
+Post-Upload Batcher - Group post-upload API calls into batch requests
+
+This module:
+- Collects post-upload calls (playlist insertions, metadata updates) from every video of a run
+- Sends them through the API's batch endpoint, up to 50 calls per HTTP round trip
+- Retries calls that failed with rate limit or server errors in a later batch
+- Reports the outcome of every call to its own callback
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from googleapiclient.errors import HttpError
+
+# The batch endpoint rejects requests with more than 50 calls
+MAX_BATCH_SIZE = 50
+
+RETRIABLE_STATUSES = {429, 500, 502, 503, 504}
+
+class PostUploadBatcher:
+    def __init__(self, batch_size: int = MAX_BATCH_SIZE, max_retries: int = 3):
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.max_retries = max_retries
+
+        self._pending: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, service, request, label: str,
+            on_done: Optional[Callable[[Optional[Dict], Optional[Exception]], None]] = None):
+        """
+        Queue an API call for the next flush
+        service: the client the request was built with (calls are batched per client, i.e. per credentials)
+        request: an unexecuted googleapiclient HttpRequest without media
+        on_done: called with (response, None) or (None, error) once the call finished
+        """
+        with self._lock:
+            self._pending.append({
+                'service': service, 'request': request, 'label': label, 'on_done': on_done, 'attempts': 0
+            })
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> Dict[str, int]:
+        """Send everything queued so far; returns counts of succeeded, failed and HTTP requests made"""
+
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        stats = {'succeeded': 0, 'failed': 0, 'http_requests': 0}
+
+        while pending:
+            retry = []
+
+            # One batch can only carry calls authorized by the same credentials
+            by_service: Dict[int, List[Dict]] = {}
+            for call in pending:
+                by_service.setdefault(id(call['service']), []).append(call)
+
+            for calls in by_service.values():
+                for start in range(0, len(calls), self.batch_size):
+                    retry.extend(self._execute_batch(calls[start:start + self.batch_size], stats))
+
+            if retry:
+                time.sleep(random.uniform(0, min(64, 2 ** retry[0]['attempts'])))
+            pending = retry
+
+        if stats['http_requests']:
+            print(f"📦 Post-upload batch: {stats['succeeded']} calls succeeded, {stats['failed']} failed "
+                  f"in {stats['http_requests']} requests")
+
+        return stats
+
+    def _execute_batch(self, calls: List[Dict], stats: Dict[str, int]) -> List[Dict]:
+        """Send one batch; returns the calls worth retrying"""
+
+        retry = []
+        answered = set()
+
+        def callback(request_id: str, response, exception):
+            call = calls[int(request_id)]
+            call['attempts'] += 1
+            answered.add(int(request_id))
+
+            if exception is None:
+                stats['succeeded'] += 1
+                self._finish(call, response, None)
+            elif (isinstance(exception, HttpError) and exception.resp.status in RETRIABLE_STATUSES
+                  and call['attempts'] <= self.max_retries):
+                retry.append(call)
+            else:
+                stats['failed'] += 1
+                print(f"⚠️  {call['label']} failed: {exception}")
+                self._finish(call, None, exception)
+
+        batch = calls[0]['service'].new_batch_http_request(callback=callback)
+        for index, call in enumerate(calls):
+            batch.add(call['request'], request_id=str(index))
+
+        try:
+            batch.execute()
+            stats['http_requests'] += 1
+        except Exception as e:
+            # The round trip failed; calls without an answer get retried (or given up on)
+            stats['http_requests'] += 1
+            for index, call in enumerate(calls):
+                if index in answered:
+                    continue
+                call['attempts'] += 1
+                if call['attempts'] <= self.max_retries:
+                    retry.append(call)
+                else:
+                    stats['failed'] += 1
+                    self._finish(call, None, e)
+
+        return retry
+
+    @staticmethod
+    def _finish(call: Dict, response: Optional[Dict], error: Optional[Exception]):
+        if call['on_done']:
+            try:
+                call['on_done'](response, error)
+            except Exception as e:
+                print(f"⚠️  Callback for {call['label']} failed: {e}")
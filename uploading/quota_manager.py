@@ -0,0 +1,271 @@
+"""
+Quota Manager - YouTube Data API budget accounting
+
+This module:
+- Prices every API call type in quota units
+- Tracks units spent per Google Cloud project per quota day (quotas reset at midnight Pacific Time)
+- Keeps a reserve for uploads by deferring low-value work (playlists, analytics reads) when the budget runs low
+- Replays deferred work once the budget allows it again
+- Forecasts how many uploads still fit in today's quota
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+try:
+    from zoneinfo import ZoneInfo
+    PACIFIC = ZoneInfo('America/Los_Angeles')
+except Exception:
+    # No tz database: Pacific Standard Time is off by an hour in summer, close enough for budgeting
+    PACIFIC = timezone(timedelta(hours=-8))
+
+# Quota units per call (YouTube Data API v3 price list)
+QUOTA_COSTS = {
+    'videos.insert': 1600,
+    'videos.update': 50,
+    'videos.list': 1,
+    'thumbnails.set': 50,
+    'playlists.insert': 50,
+    'playlists.list': 1,
+    'playlistItems.insert': 50,
+    'playlistItems.list': 1,
+    'channels.list': 1,
+    'commentThreads.insert': 50,
+    'search.list': 100
+}
+
+# Lower numbers win; LOW work never eats into the reserve kept for uploads
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_usage (
+    project TEXT NOT NULL,
+    day TEXT NOT NULL,
+    method TEXT NOT NULL,
+    calls INTEGER NOT NULL DEFAULT 0,
+    units INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (project, day, method)
+);
+CREATE TABLE IF NOT EXISTS deferred_calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project TEXT NOT NULL,
+    method TEXT NOT NULL,
+    action TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+class QuotaExceeded(Exception):
+    """The call does not fit in what is left of today's quota"""
+
+    def __init__(self, message: str, retry_at: float):
+        super().__init__(message)
+        self.retry_at = retry_at
+
+def quota_day(now: Optional[datetime] = None) -> str:
+    """The quota day (Pacific Time date) a moment falls into"""
+    return (now or datetime.now(timezone.utc)).astimezone(PACIFIC).date().isoformat()
+
+def next_reset(now: Optional[datetime] = None) -> float:
+    """Epoch seconds of the next quota reset (midnight Pacific Time)"""
+    local = (now or datetime.now(timezone.utc)).astimezone(PACIFIC)
+    midnight = datetime.combine(local.date() + timedelta(days=1), datetime.min.time(), tzinfo=PACIFIC)
+    return midnight.timestamp()
+
+class QuotaManager:
+    def __init__(self, db_path: str = "data/api_quota.db", daily_quota: int = 10000,
+                 project_quotas: Optional[Dict[str, int]] = None, reserved_uploads: int = 1):
+        """
+        daily_quota: units per project per day unless project_quotas overrides it
+        reserved_uploads: uploads' worth of units that low-priority work must leave untouched
+        """
+        self.db_path = db_path
+        self.daily_quota = daily_quota
+        self.project_quotas = project_quotas or {}
+        self.reserve_units = reserved_uploads * QUOTA_COSTS['videos.insert']
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+
+        # Shared with other processes (parallel channel workers) through SQLite's locking
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def cost(method: str, calls: int = 1) -> int:
+        if method not in QUOTA_COSTS:
+            raise ValueError(f"Unknown API method {method!r}; add it to QUOTA_COSTS")
+        return QUOTA_COSTS[method] * calls
+
+    def limit(self, project: str) -> int:
+        return self.project_quotas.get(project, self.daily_quota)
+
+    def _used(self, project: str, day: str) -> int:
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(units), 0) AS used FROM quota_usage WHERE project = ? AND day = ?",
+            (project, day)
+        ).fetchone()
+        return row['used']
+
+    def used(self, project: str) -> int:
+        """Units spent today"""
+        with self._lock:
+            return self._used(project, quota_day())
+
+    def remaining(self, project: str) -> int:
+        """Units left today"""
+        return max(0, self.limit(project) - self.used(project))
+
+    def _floor(self, priority: int) -> int:
+        """Units a call of this priority must leave unspent"""
+        return self.reserve_units if priority >= PRIORITY_LOW else 0
+
+    def try_spend(self, method: str, project: str, priority: int = PRIORITY_NORMAL, calls: int = 1) -> bool:
+        """Record the calls if they fit in today's budget for their priority; False (nothing recorded) otherwise"""
+
+        units = self.cost(method, calls)
+        day = quota_day()
+
+        with self._lock:
+            # IMMEDIATE takes the write lock up front so concurrent processes can't both pass the check
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self.limit(project) - self._used(project, day) - units < self._floor(priority):
+                    self._conn.execute("ROLLBACK")
+                    return False
+
+                self._conn.execute(
+                    "INSERT INTO quota_usage (project, day, method, calls, units) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (project, day, method) DO UPDATE SET "
+                    "calls = calls + excluded.calls, units = units + excluded.units",
+                    (project, day, method, calls, units)
+                )
+                self._conn.execute("COMMIT")
+                return True
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def spend(self, method: str, project: str, priority: int = PRIORITY_HIGH, calls: int = 1):
+        """Like try_spend, but raises QuotaExceeded when the calls don't fit"""
+        if not self.try_spend(method, project, priority, calls):
+            raise QuotaExceeded(
+                f"{method} needs {self.cost(method, calls)} units, "
+                f"{self.remaining(project)} of {self.limit(project)} left today for {project}",
+                retry_at=next_reset()
+            )
+
+    def mark_exhausted(self, project: str):
+        """The API reported quotaExceeded: treat the rest of today as spent"""
+
+        day = quota_day()
+
+        with self._lock:
+            shortfall = self.limit(project) - self._used(project, day)
+            if shortfall > 0:
+                self._conn.execute(
+                    "INSERT INTO quota_usage (project, day, method, calls, units) VALUES (?, ?, 'unaccounted', 0, ?) "
+                    "ON CONFLICT (project, day, method) DO UPDATE SET units = units + excluded.units",
+                    (project, day, shortfall)
+                )
+
+    def defer(self, project: str, method: str, action: str, payload: Dict, priority: int = PRIORITY_LOW):
+        """Park a call that didn't fit; run_deferred replays it through the handler named action"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO deferred_calls (project, method, action, payload, priority, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (project, method, action, json.dumps(payload), priority, time.time())
+            )
+
+    def deferred(self, project: Optional[str] = None) -> List[Dict]:
+        """Parked calls, most important and oldest first"""
+
+        query = "SELECT * FROM deferred_calls"
+        params = ()
+        if project is not None:
+            query += " WHERE project = ?"
+            params = (project,)
+
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY priority, created_at", params).fetchall()
+
+        return [dict(row, payload=json.loads(row['payload'])) for row in rows]
+
+    def run_deferred(self, handlers: Dict[str, Callable[..., None]], project: Optional[str] = None) -> int:
+        """
+        Replay parked calls while the budget allows; returns how many ran
+        handlers: action name -> callable taking the stored payload as keyword arguments
+        """
+
+        ran = 0
+        blocked = set()
+
+        for call in self.deferred(project):
+            if call['project'] in blocked or call['action'] not in handlers:
+                continue
+
+            if not self.try_spend(call['method'], call['project'], call['priority']):
+                # Later calls of this project are no more important; wait for more budget
+                blocked.add(call['project'])
+                continue
+
+            with self._lock:
+                self._conn.execute("DELETE FROM deferred_calls WHERE id = ?", (call['id'],))
+
+            try:
+                handlers[call['action']](**call['payload'])
+                ran += 1
+            except Exception as e:
+                print(f"⚠️  Deferred {call['action']} failed: {e}")
+
+        return ran
+
+    def forecast_uploads_remaining(self, project: str, follow_up_units: int = 0) -> int:
+        """Uploads that still fit today, each costing an insert plus follow_up_units"""
+        return self.remaining(project) // (self.cost('videos.insert') + follow_up_units)
+
+    def report(self, project: str) -> Dict:
+        """Today's usage of a project broken down by method"""
+
+        day = quota_day()
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT method, calls, units FROM quota_usage WHERE project = ? AND day = ? ORDER BY units DESC",
+                (project, day)
+            ).fetchall()
+            pending = self._conn.execute(
+                "SELECT COUNT(*) AS count FROM deferred_calls WHERE project = ?", (project,)
+            ).fetchone()['count']
+
+        used = sum(row['units'] for row in rows)
+
+        return {
+            'project': project,
+            'day': day,
+            'limit': self.limit(project),
+            'used': used,
+            'remaining': max(0, self.limit(project) - used),
+            'by_method': {row['method']: {'calls': row['calls'], 'units': row['units']} for row in rows},
+            'deferred_calls': pending,
+            'uploads_remaining': self.forecast_uploads_remaining(project),
+            'resets_at': datetime.fromtimestamp(next_reset(), PACIFIC).isoformat()
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,44 @@
+"""
+Streaming Upload - Resumable YouTube uploads of a video that is still being encoded
+
+This module:
+- Feeds a GrowingFile into googleapiclient's resumable upload protocol
+- Sends chunks with an unknown total size ("bytes a-b/*") while the encoder writes
+- Declares the real size with the last chunk once the encoder has finished
+"""
+
+from typing import Optional
+
+from googleapiclient.http import MediaIoBaseUpload
+
+from pipeline.growing_file import GrowingFile
+
+# Resumable upload chunks must be multiples of 256 KiB (except the last one)
+CHUNK_GRANULARITY = 256 * 1024
+
+class StreamingMediaUpload(MediaIoBaseUpload):
+    def __init__(self, stream: GrowingFile, mimetype: str = 'video/mp4', chunksize: int = 8 * 1024 * 1024):
+        chunksize = max(CHUNK_GRANULARITY, chunksize // CHUNK_GRANULARITY * CHUNK_GRANULARITY)
+        super().__init__(stream, mimetype, chunksize=chunksize, resumable=True)
+
+        self._stream = stream
+        self._next_offset = 0
+
+    def size(self) -> Optional[int]:
+        """
+        None while the encoder is still writing, the final size once it is done
+        Waits until the next chunk is known not to be the last one, so a file that
+        ends exactly on a chunk boundary is still closed with its real size
+        """
+        self._stream.wait_for(self._next_offset + self._chunksize + 1)
+        return self._stream.final_size()
+
+    def has_stream(self) -> bool:
+        # Force googleapiclient onto getbytes(), the only path that copes with an unknown size
+        return False
+
+    def getbytes(self, begin: int, length: int) -> bytes:
+        self._stream.seek(begin)
+        data = self._stream.read(length)
+        self._next_offset = begin + len(data)
+        return data
@@ -0,0 +1,375 @@
+"""
+Upload Queue - Durable, scheduled uploads that survive restarts
+
+This module:
+- Stores scheduled uploads in SQLite so nothing is lost when the process exits
+- Hands due uploads to workers in (scheduled time, priority) order from an in-memory heap
+- Leases jobs to workers and re-queues them when a worker dies mid-upload
+- Keeps retries idempotent: one row per idempotency key, and the optimized
+  metadata is fixed on the first attempt so retries resume the same upload session
+- Runs as a long-lived daemon that fires uploads at their scheduled time
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import random
+import signal
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    channel_id TEXT NOT NULL,
+    video_data TEXT NOT NULL,
+    metadata TEXT,
+    scheduled_at REAL NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    result TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS uploads_due ON uploads (status, scheduled_at);
+"""
+
+def _to_timestamp(when: Union[str, datetime, float, int, None]) -> float:
+    """Epoch seconds for an ISO string, datetime or number (None = now)"""
+    if when is None:
+        return time.time()
+    if isinstance(when, (int, float)):
+        return float(when)
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when)
+    return when.timestamp()
+
+class UploadQueue:
+    def __init__(self, db_path: str = "data/upload_queue.db", lease_seconds: float = 900,
+                 max_attempts: int = 5, retry_delay: float = 300):
+        """
+        lease_seconds: how long a worker owns a job before others may take it over
+        max_attempts: uploads are marked failed after this many unsuccessful tries
+        retry_delay: base delay in seconds before a failed upload is retried (doubles per attempt)
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+
+        # One connection shared by the daemon's threads, serialized by a lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def make_idempotency_key(channel_id: str, video_data: Dict, scheduled_time) -> str:
+        """Same video, channel and slot -> same key, so re-enqueueing a schedule is a no-op"""
+        identity = json.dumps({
+            'channel_id': channel_id,
+            'video_path': video_data.get('video_path'),
+            'title': video_data.get('title'),
+            'scheduled_at': _to_timestamp(scheduled_time)
+        }, sort_keys=True)
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def enqueue(self, channel_id: str, video_data: Dict, scheduled_time=None, priority: int = 0,
+                idempotency_key: Optional[str] = None) -> int:
+        """Add an upload (ignored if its idempotency key is already queued); returns its row id"""
+
+        key = idempotency_key or self.make_idempotency_key(channel_id, video_data, scheduled_time)
+        now = time.time()
+
+        # The stream handle of a streamed render can't be stored; the finished file path can
+        payload = {k: v for k, v in video_data.items() if k != 'video_stream'}
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO uploads (idempotency_key, channel_id, video_data, scheduled_at, "
+                "priority, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, channel_id, json.dumps(payload), _to_timestamp(scheduled_time), priority, now, now)
+            )
+            row = self._conn.execute("SELECT id FROM uploads WHERE idempotency_key = ?", (key,)).fetchone()
+
+        return row['id']
+
+    def enqueue_scheduled(self, scheduled_uploads: List[Dict], priority: int = 0) -> List[int]:
+        """Queue the output of YouTubeAutomator.schedule_optimal_uploads"""
+        return [
+            self.enqueue(upload['channel_id'], upload['video_data'], upload['scheduled_time'], priority)
+            for upload in scheduled_uploads
+        ]
+
+    def enqueue_bulk(self, all_scheduled: Dict[str, List[Dict]], priority: int = 0) -> List[int]:
+        """Queue the output of YouTubeAutomator.bulk_upload_scheduler"""
+        ids = []
+        for scheduled_uploads in all_scheduled.values():
+            ids.extend(self.enqueue_scheduled(scheduled_uploads, priority))
+        return ids
+
+    def pending(self) -> List[sqlite3.Row]:
+        """Jobs that are waiting or whose lease has expired, due or not"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, scheduled_at, priority FROM uploads "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?)",
+                (time.time(),)
+            ).fetchall()
+
+    def claim(self, job_id: int, owner: str) -> Optional[Dict]:
+        """Lease a due job to owner; None if someone else got it first or it isn't due"""
+
+        now = time.time()
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE uploads SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ? AND scheduled_at <= ? "
+                "AND (status = 'pending' OR (status = 'leased' AND lease_expires < ?))",
+                (owner, now + self.lease_seconds, now, job_id, now, now)
+            )
+            if cursor.rowcount != 1:
+                return None
+
+            row = self._conn.execute("SELECT * FROM uploads WHERE id = ?", (job_id,)).fetchone()
+
+        return self._row_to_job(row)
+
+    def renew(self, job_id: int, owner: str) -> bool:
+        """Extend a lease while the upload is still running; False if it was lost"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE uploads SET lease_expires = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time() + self.lease_seconds, job_id, owner)
+            )
+        return cursor.rowcount == 1
+
+    def save_metadata(self, job_id: int, metadata: Dict):
+        """Pin the optimized metadata so every retry uploads the same resource"""
+        with self._lock:
+            self._conn.execute("UPDATE uploads SET metadata = ? WHERE id = ?", (json.dumps(metadata), job_id))
+
+    def complete(self, job_id: int, owner: str, result: Dict):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE uploads SET status = 'done', result = ?, lease_owner = NULL, lease_expires = NULL, "
+                "last_error = NULL, updated_at = ? WHERE id = ? AND lease_owner = ?",
+                (json.dumps(result), time.time(), job_id, owner)
+            )
+
+    def fail(self, job_id: int, owner: str, error: str, attempts: int, retry_at: Optional[float] = None):
+        """
+        Re-queue with exponential backoff, or give up after max_attempts
+        retry_at: the upload was refused for lack of API quota; retry then without using up an attempt
+        """
+
+        now = time.time()
+
+        if retry_at is not None:
+            status, scheduled_at = 'pending', retry_at
+            attempts -= 1
+        elif attempts >= self.max_attempts:
+            status, scheduled_at = 'failed', None
+        else:
+            status = 'pending'
+            scheduled_at = now + random.uniform(0.5, 1.0) * self.retry_delay * 2 ** (attempts - 1)
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE uploads SET status = ?, scheduled_at = COALESCE(?, scheduled_at), attempts = ?, "
+                "last_error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ?",
+                (status, scheduled_at, attempts, error, now, job_id, owner)
+            )
+
+    def release_leases(self, owner_prefix: str) -> int:
+        """Hand back every lease held by owners starting with owner_prefix (used on startup and shutdown)"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE uploads SET status = 'pending', lease_owner = NULL, lease_expires = NULL, "
+                "attempts = MAX(attempts - 1, 0), updated_at = ? "
+                "WHERE status = 'leased' AND lease_owner LIKE ?",
+                (time.time(), owner_prefix + '%')
+            )
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS count FROM uploads GROUP BY status").fetchall()
+        return {row['status']: row['count'] for row in rows}
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job['video_data'] = json.loads(job['video_data'])
+        job['metadata'] = json.loads(job['metadata']) if job['metadata'] else None
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class UploadQueueDaemon:
+    def __init__(self, queue: UploadQueue, automator, workers: int = 2, poll_interval: float = 30.0):
+        """
+        automator: YouTubeAutomator used for the actual uploads
+        workers: uploads running at the same time
+        poll_interval: longest sleep between checks for newly queued or expired jobs
+        """
+        self.queue = queue
+        self.automator = automator
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+
+        # Leases from an earlier run on this host are recognizable by the host prefix
+        self.host_prefix = f"{socket.gethostname()}:"
+        self.owner = f"{self.host_prefix}{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._heap = []
+        self._queued = set()
+        self._running = set()
+        self._running_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def recover(self) -> int:
+        """
+        Return jobs leased by a previous daemon on this host that died mid-upload
+        Only call when no other daemon runs on this host; others still wait for lease expiry
+        """
+        released = self.queue.release_leases(self.host_prefix)
+        if released:
+            print(f"♻️ Recovered {released} interrupted uploads")
+        return released
+
+    def _refresh_heap(self):
+        """Load jobs added or re-queued since the last look (also by other processes)"""
+        for row in self.queue.pending():
+            if row['id'] not in self._queued:
+                heapq.heappush(self._heap, (row['scheduled_at'], -row['priority'], row['id']))
+                self._queued.add(row['id'])
+
+    def run_forever(self, recover: bool = True):
+        """Fire uploads as they fall due until stop() is called or SIGTERM/SIGINT arrives"""
+
+        if recover:
+            self.recover()
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: self.stop())
+
+        print(f"⏰ Upload queue daemon running ({self.workers} workers): {self.queue.stats()}")
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='upload-queue') as executor:
+            try:
+                while not self._stop.is_set():
+                    self._refresh_heap()
+                    self._dispatch_due(executor)
+                    self._stop.wait(self._sleep_time())
+            except KeyboardInterrupt:
+                self.stop()
+
+        # Anything still leased by this daemon was interrupted; hand it back right away
+        self.queue.release_leases(self.owner)
+        print("👋 Upload queue daemon stopped")
+
+    def stop(self):
+        self._stop.set()
+
+    def _dispatch_due(self, executor: ThreadPoolExecutor):
+        now = time.time()
+
+        while self._heap and self._heap[0][0] <= now:
+            with self._running_lock:
+                if len(self._running) >= self.workers:
+                    return
+
+            _, _, job_id = heapq.heappop(self._heap)
+            self._queued.discard(job_id)
+
+            job = self.queue.claim(job_id, self.owner)
+            if job is None:
+                # Rescheduled, finished or taken by another daemon meanwhile
+                continue
+
+            with self._running_lock:
+                self._running.add(job_id)
+            executor.submit(self._run_job, job)
+
+    def _sleep_time(self) -> float:
+        with self._running_lock:
+            busy = len(self._running) >= self.workers
+        if busy or not self._heap:
+            return min(self.poll_interval, 1.0) if busy else self.poll_interval
+        return max(0.0, min(self.poll_interval, self._heap[0][0] - time.time()))
+
+    def _run_job(self, job: Dict):
+        """Worker thread: upload one job while keeping its lease alive"""
+
+        job_id = job['id']
+        done = threading.Event()
+
+        def heartbeat():
+            while not done.wait(self.queue.lease_seconds / 3):
+                if not self.queue.renew(job_id, self.owner):
+                    return
+
+        threading.Thread(target=heartbeat, name=f"lease-{job_id}", daemon=True).start()
+
+        try:
+            metadata = job['metadata']
+            if metadata is None:
+                channel_config = self.automator.config['channels'][job['channel_id']]
+                metadata = self.automator._optimize_video_metadata(job['video_data'], channel_config)
+                self.queue.save_metadata(job_id, metadata)
+
+            print(f"📤 Queue: uploading job {job_id} for {job['channel_id']} (attempt {job['attempts']})")
+            result = self.automator.upload_video_optimized(job['video_data'], job['channel_id'], metadata=metadata)
+
+            if result.get('id'):
+                self.queue.complete(job_id, self.owner, result)
+                print(f"✅ Queue: job {job_id} uploaded as {result['id']}")
+            else:
+                self.queue.fail(job_id, self.owner, result.get('error', 'upload failed'), job['attempts'],
+                                retry_at=result.get('retry_at'))
+                print(f"⚠️  Queue: job {job_id} failed: {result.get('error')}")
+        except Exception as e:
+            self.queue.fail(job_id, self.owner, str(e), job['attempts'])
+            print(f"⚠️  Queue: job {job_id} failed: {e}")
+        finally:
+            done.set()
+            with self._running_lock:
+                self._running.discard(job_id)
+
+# Example usage: run the daemon
+if __name__ == "__main__":
+    import sys
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from uploading.youtube_automator import YouTubeAutomator
+
+    automator = YouTubeAutomator()
+    settings = automator.config.get('global_settings', {})
+
+    queue = UploadQueue(settings.get('upload_queue_db', 'data/upload_queue.db'))
+    UploadQueueDaemon(queue, automator, workers=settings.get('upload_queue_workers', 2)).run_forever()
@@ -17,15 +17,26 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import time
 import random
+import threading
+from contextlib import contextmanager
+
+import httplib2
 
 # YouTube API imports
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload
-from google.auth.transport.requests import Request
+from google.auth.transport.requests import AuthorizedSession, Request
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.oauth2.credentials import Credentials
 
+from uploading.chunked_uploader import ChunkedUploader, UploadError
+from uploading.post_upload_batcher import PostUploadBatcher
+from uploading.quota_manager import PRIORITY_LOW, QuotaExceeded, QuotaManager, next_reset
+from uploading.streaming_upload import StreamingMediaUpload
+
+# Resumable upload endpoint for videos.insert
+VIDEO_UPLOAD_URL = "https://www.googleapis.com/upload/youtube/v3/videos"
+
 class YouTubeAutomator:
     def __init__(self, config_path: str = "config/channels_config.json"):
         with open(config_path, 'r') as f:
@@ -39,12 +50,43 @@ class YouTubeAutomator:
         self.credentials_file = "config/youtube_credentials.json"
         self.token_file = "config/youtube_token.pickle"
         
+        settings = self.config.get('global_settings', {})
+        
+        # Starting chunk size for uploads (finished files adapt it to the measured throughput)
+        self.streaming_chunk_size = settings.get('upload_chunk_mb', 8) * 1024 * 1024
+        self.upload_sessions_dir = settings.get('upload_sessions_dir', 'data/upload_sessions')
+        self.upload_max_retries = settings.get('upload_max_retries', 8)
+        
+        # Data API quota, the real daily budget of every Cloud project we upload through
+        self.default_api_project = settings.get('api_project', 'default')
+        self.quota = QuotaManager(
+            settings.get('api_quota_db', 'data/api_quota.db'),
+            daily_quota=settings.get('api_daily_quota', 10000),
+            project_quotas=settings.get('api_project_quotas'),
+            reserved_uploads=settings.get('quota_reserved_uploads', 1)
+        )
+        
+        # Post-upload calls of a batched run wait here until the run ends
+        self._post_upload_batch: Optional[PostUploadBatcher] = None
+        self._post_upload_batch_lock = threading.Lock()
+        
+        # In a worker process, post-upload calls are collected here for the parent to send
+        self._post_upload_handoff: Optional[List[Dict]] = None
+        
+        # API clients of channels with their own token, built on first use
+        self._channel_services: Dict[str, object] = {}
+        self._channel_services_lock = threading.Lock()
+        
         # Analytics tracking
         self.analytics_file = "data/analytics.json"
+        # Uploads finishing on several threads (pipelined stage, queue daemon) append to the same file
+        self._analytics_lock = threading.Lock()
         self._ensure_data_directory()
         
         # Initialize YouTube service
+        self.credentials = None
         self.youtube_service = None
+        self.chunked_uploader = None
         self._setup_youtube_service()
     
     def _ensure_data_directory(self):
@@ -52,13 +94,13 @@ class YouTubeAutomator:
         os.makedirs("data", exist_ok=True)
         os.makedirs("config", exist_ok=True)
     
-    def _setup_youtube_service(self):
-        """Setup YouTube API service with authentication"""
+    def _load_credentials(self, token_file: str, interactive: bool = True) -> Optional[Credentials]:
+        """Load (and refresh) the OAuth token in token_file, running the consent flow if allowed"""
         creds = None
         
         # Load existing token
-        if os.path.exists(self.token_file):
-            with open(self.token_file, 'rb') as token:
+        if os.path.exists(token_file):
+            with open(token_file, 'rb') as token:
                 creds = pickle.load(token)
         
         # If there are no valid credentials, get new ones
@@ -66,50 +108,125 @@ class YouTubeAutomator:
             if creds and creds.expired and creds.refresh_token:
                 creds.refresh(Request())
             else:
-                if os.path.exists(self.credentials_file):
+                if interactive and os.path.exists(self.credentials_file):
                     flow = InstalledAppFlow.from_client_secrets_file(
                         self.credentials_file, self.SCOPES)
                     creds = flow.run_local_server(port=0)
                 else:
-                    print("⚠️  YouTube credentials not found. Please add youtube_credentials.json")
-                    return
+                    return None
         
             # Save credentials for next run
-            with open(self.token_file, 'wb') as token:
+            with open(token_file, 'wb') as token:
                 pickle.dump(creds, token)
         
+        return creds
+    
+    def channel_credentials(self, channel_id: str) -> Optional[Credentials]:
+        """Credentials for a channel: config/youtube_token_<channel_id>.pickle, else the shared token"""
+        
+        channel_token_file = f"config/youtube_token_{channel_id}.pickle"
+        if os.path.exists(channel_token_file):
+            return self._load_credentials(channel_token_file, interactive=False)
+        
+        return self.credentials
+    
+    def channel_service(self, channel_id: Optional[str]):
+        """YouTube API client acting for a channel (the shared one unless it has its own token)"""
+        
+        if channel_id is None:
+            return self.youtube_service
+        
+        with self._channel_services_lock:
+            if channel_id not in self._channel_services:
+                creds = self.channel_credentials(channel_id)
+                if creds is None or creds is self.credentials:
+                    service = self.youtube_service
+                else:
+                    service = build('youtube', 'v3', credentials=creds)
+                self._channel_services[channel_id] = service
+            
+            return self._channel_services[channel_id]
+    
+    def _setup_youtube_service(self):
+        """Setup YouTube API service with authentication"""
+        creds = self._load_credentials(self.token_file)
+        
+        if creds is None:
+            print("⚠️  YouTube credentials not found. Please add youtube_credentials.json")
+            return
+        
+        self.credentials = creds
+        
         try:
             self.youtube_service = build('youtube', 'v3', credentials=creds)
+            self.chunked_uploader = ChunkedUploader(
+                AuthorizedSession(creds),
+                state_dir=self.upload_sessions_dir,
+                initial_chunk_size=self.streaming_chunk_size,
+                max_retries=self.upload_max_retries,
+                progress_callback=lambda sent, total: print(f"Upload progress: {sent * 100 // total}%")
+            )
             print("✅ YouTube API service initialized")
         except Exception as e:
             print(f"❌ Failed to initialize YouTube service: {e}")
     
-    def upload_video_optimized(self, video_data: Dict, channel_id: str) -> Dict:
+    def upload_video_optimized(self, video_data: Dict, channel_id: str, metadata: Optional[Dict] = None) -> Dict:
         """
         Upload video with full SEO and algorithm optimization
+        metadata: previously optimized metadata to reuse (retries must send the same resource
+        to resume their upload session)
         """
         if not self.youtube_service:
             return {"error": "YouTube service not initialized"}
         
         channel_config = self.config['channels'][channel_id]
+        project = self._api_project(channel_config)
         
         # Optimize video metadata for maximum reach
-        optimized_metadata = self._optimize_video_metadata(video_data, channel_config)
+        optimized_metadata = metadata or self._optimize_video_metadata(video_data, channel_config)
+        
+        # Uploads are by far the most expensive call; refuse them rather than run the project dry
+        try:
+            self.quota.spend('videos.insert', project)
+        except QuotaExceeded as e:
+            print(f"⏸️  Upload postponed: {e}")
+            return {"error": str(e), "retry_at": e.retry_at}
         
         # Upload video
         upload_result = self._upload_to_youtube(video_data, optimized_metadata)
         
+        if 'quotaExceeded' in upload_result.get('error', ''):
+            # Someone else spent this project's quota; our books were behind
+            self.quota.mark_exhausted(project)
+            upload_result['retry_at'] = next_reset()
+        
         if upload_result.get('id'):
             # Post-upload optimization
-            self._post_upload_optimization(upload_result['id'], channel_config)
+            self._post_upload_optimization(upload_result['id'], channel_config, channel_id)
             
             # Track analytics
             self._track_upload_analytics(upload_result, channel_id)
             
             print(f"✅ Video uploaded successfully: {upload_result['id']}")
             
+            # Catch up on low-value work parked while the budget was tight
+            self.run_deferred_calls(project)
+            
         return upload_result
     
+    def _api_project(self, channel_config: Dict) -> str:
+        """Cloud project whose quota a channel's calls draw from"""
+        return channel_config.get('api_project') or self.default_api_project
+    
+    def run_deferred_calls(self, project: Optional[str] = None) -> int:
+        """Replay calls deferred for lack of quota, as far as today's budget allows"""
+        return self.quota.run_deferred({'add_to_playlist': self._add_to_optimal_playlist}, project)
+    
+    def quota_report(self) -> Dict:
+        """Today's quota usage and upload forecast for every project in use"""
+        projects = {self._api_project(c) for c in self.config['channels'].values()}
+        return {project: self.quota.report(project) for project in sorted(projects)}
+    
     def _optimize_video_metadata(self, video_data: Dict, channel_config: Dict) -> Dict:
         """Optimize video metadata for YouTube algorithm"""
         
@@ -299,30 +416,25 @@ class YouTubeAutomator:
         """Upload video to YouTube with optimized settings"""
         
         try:
-            # Media upload
-            media = MediaFileUpload(
-                video_data['video_path'],
-                chunksize=-1,
-                resumable=True,
-                mimetype='video/mp4'
-            )
-            
             # Video resource
-            video_resource = {
-                'snippet': {
-                    'title': metadata['title'],
-                    'description': metadata['description'],
-                    'tags': metadata['tags'],
-                    'categoryId': metadata['categoryId'],
-                    'defaultLanguage': metadata['defaultLanguage'],
-                    'defaultAudioLanguage': metadata['defaultAudioLanguage']
-                },
-                'status': {
-                    'privacyStatus': metadata['privacyStatus'],
-                    'madeForKids': False,  # Important for monetization
-                    'selfDeclaredMadeForKids': False
-                }
-            }
+            video_resource = self._build_video_resource(metadata)
+            
+            if not video_data.get('video_stream'):
+                # Finished file: chunked, resumable across restarts
+                print("📤 Uploading video...")
+                response = self.chunked_uploader.upload(
+                    video_data['video_path'], video_resource, VIDEO_UPLOAD_URL,
+                    params={'part': 'snippet,status'}, mimetype='video/mp4'
+                )
+                print("✅ Upload completed successfully!")
+                return response
+            
+            # Still being encoded: send chunks as the encoder writes them
+            media = StreamingMediaUpload(
+                video_data['video_stream'],
+                mimetype='video/mp4',
+                chunksize=self.streaming_chunk_size
+            )
             
             # Upload video
             upload_request = self.youtube_service.videos().insert(
@@ -335,6 +447,9 @@ class YouTubeAutomator:
             
             return response
             
+        except UploadError as e:
+            print(f"❌ Upload failed: {e}")
+            return {"error": str(e)}
         except HttpError as e:
             print(f"❌ HTTP Error during upload: {e}")
             return {"error": str(e)}
@@ -342,6 +457,25 @@ class YouTubeAutomator:
             print(f"❌ Unexpected error during upload: {e}")
             return {"error": str(e)}
     
+    def _build_video_resource(self, metadata: Dict) -> Dict:
+        """videos.insert body for the optimized metadata"""
+        
+        return {
+            'snippet': {
+                'title': metadata['title'],
+                'description': metadata['description'],
+                'tags': metadata['tags'],
+                'categoryId': metadata['categoryId'],
+                'defaultLanguage': metadata['defaultLanguage'],
+                'defaultAudioLanguage': metadata['defaultAudioLanguage']
+            },
+            'status': {
+                'privacyStatus': metadata['privacyStatus'],
+                'madeForKids': False,  # Important for monetization
+                'selfDeclaredMadeForKids': False
+            }
+        }
+    
     def _execute_upload(self, upload_request) -> Dict:
         """Execute the upload with progress tracking"""
         
@@ -357,15 +491,25 @@ class YouTubeAutomator:
                 if status:
                     progress = int(status.progress() * 100)
                     print(f"Upload progress: {progress}%")
+                
+                # Only consecutive failures count towards the retry limit
+                retry = 0
                     
             except HttpError as e:
-                if e.resp.status in [500, 502, 503, 504]:
+                if e.resp.status in [429, 500, 502, 503, 504] and retry < self.upload_max_retries:
                     # Retriable errors
                     error = f"Retriable error: {e}"
-                    time.sleep(2 ** retry)
                     retry += 1
+                    self._sleep_before_retry(retry)
                 else:
                     raise e
+            except (ConnectionError, TimeoutError, httplib2.HttpLib2Error) as e:
+                # Dropped connections; the next call asks the server where to continue
+                error = f"Connection error: {e}"
+                if retry >= self.upload_max_retries:
+                    break
+                retry += 1
+                self._sleep_before_retry(retry)
             except Exception as e:
                 error = f"Unexpected error: {e}"
                 break
@@ -377,15 +521,26 @@ class YouTubeAutomator:
             print(f"❌ Upload failed: {error}")
             return {"error": error}
     
-    def _post_upload_optimization(self, video_id: str, channel_config: Dict):
-        """Perform post-upload optimizations"""
+    def _sleep_before_retry(self, retry: int):
+        """Exponential backoff with full jitter, capped at a minute"""
+        time.sleep(random.uniform(0, min(64, 2 ** retry)))
+    
+    def _post_upload_optimization(self, video_id: str, channel_config: Dict, channel_id: str):
+        """Perform post-upload optimizations (API calls made with the channel's own credentials)"""
         
         try:
             # Set custom thumbnail if available
             # self._set_custom_thumbnail(video_id, thumbnail_path)
             
-            # Add video to playlists for better organization
-            self._add_to_optimal_playlist(video_id, channel_config)
+            # Add video to playlists for better organization (only if it leaves room for uploads)
+            project = self._api_project(channel_config)
+            calls_api = bool(channel_config.get('playlist_id') and self.channel_service(channel_id))
+            if not calls_api or self.quota.try_spend('playlistItems.insert', project, PRIORITY_LOW):
+                self._add_to_optimal_playlist(video_id, channel_config, channel_id)
+            else:
+                self.quota.defer(project, 'playlistItems.insert', 'add_to_playlist',
+                                 {'video_id': video_id, 'channel_config': channel_config, 'channel_id': channel_id})
+                print(f"⏸️  Playlist update for {video_id} deferred to save quota")
             
             # Set end screen and cards for engagement
             # self._setup_end_screen(video_id)
@@ -395,19 +550,117 @@ class YouTubeAutomator:
         except Exception as e:
             print(f"⚠️  Post-upload optimization failed: {e}")
     
-    def _add_to_optimal_playlist(self, video_id: str, channel_config: Dict):
-        """Add video to relevant playlist for better organization"""
+    def _add_to_optimal_playlist(self, video_id: str, channel_config: Dict, channel_id: Optional[str] = None):
+        """
+        Add video to relevant playlist for better organization
+        channel_id: whose credentials make the call (None = the shared ones, as in calls deferred before it was recorded)
+        """
         
-        # This would get or create playlists based on channel niche
-        # For now, we'll just log the action
         playlist_name = f"{channel_config['name']} - Latest Videos"
         print(f"📋 Adding video to playlist: {playlist_name}")
+        
+        # Channels without a configured playlist_id only log the action
+        playlist_id = channel_config.get('playlist_id')
+        if not playlist_id or not self.channel_service(channel_id):
+            return
+        
+        with self._post_upload_batch_lock:
+            handoff = self._post_upload_handoff
+        
+        if handoff is not None:
+            handoff.append({'call': 'insert_playlist_item',
+                            'args': {'video_id': video_id, 'playlist_id': playlist_id, 'channel_id': channel_id}})
+            return
+        
+        self._insert_playlist_item(video_id, playlist_id, channel_id)
+    
+    def _insert_playlist_item(self, video_id: str, playlist_id: str, channel_id: Optional[str] = None):
+        """Send (or batch) the playlistItems.insert of a video with its channel's client"""
+        
+        service = self.channel_service(channel_id)
+        if not service:
+            return
+        
+        request = service.playlistItems().insert(
+            part='snippet',
+            body={
+                'snippet': {
+                    'playlistId': playlist_id,
+                    'resourceId': {'kind': 'youtube#video', 'videoId': video_id}
+                }
+            }
+        )
+        self._submit_post_upload_call(service, request, f"Playlist insertion of {video_id}")
+    
+    def _submit_post_upload_call(self, service, request, label: str):
+        """
+        Run a post-upload API call now, or queue it for the batch of the current run
+        service: the client request was built with (batches never mix credentials)
+        """
+        
+        with self._post_upload_batch_lock:
+            batch = self._post_upload_batch
+        
+        if batch is not None:
+            batch.add(service, request, label)
+            return
+        
+        try:
+            request.execute()
+        except HttpError as e:
+            print(f"⚠️  {label} failed: {e}")
+    
+    @contextmanager
+    def batched_post_upload(self, batch_size: int = 50):
+        """
+        Collect the post-upload calls of every video uploaded inside the block and
+        send them in batches of up to batch_size calls when it exits
+        Media uploads (custom thumbnails) can't go through the batch endpoint
+        """
+        
+        with self._post_upload_batch_lock:
+            # Nested run: the outermost block flushes
+            nested = self._post_upload_batch is not None
+            if not nested:
+                self._post_upload_batch = PostUploadBatcher(batch_size)
+            batch = self._post_upload_batch
+        
+        try:
+            yield batch
+        finally:
+            if not nested:
+                with self._post_upload_batch_lock:
+                    self._post_upload_batch = None
+                batch.flush()
+    
+    @contextmanager
+    def handed_off_post_upload(self):
+        """
+        Collect the post-upload calls made inside the block as plain data instead of sending them
+        For worker processes: their parent passes the list to replay_post_upload_calls inside
+        its own batched_post_upload block, so the calls of all workers share its batches
+        """
+        
+        calls: List[Dict] = []
+        with self._post_upload_batch_lock:
+            self._post_upload_handoff = calls
+        
+        try:
+            yield calls
+        finally:
+            with self._post_upload_batch_lock:
+                self._post_upload_handoff = None
+    
+    def replay_post_upload_calls(self, calls: List[Dict]):
+        """Send post-upload calls handed off by a worker (batched if inside batched_post_upload)"""
+        
+        functions = {'insert_playlist_item': self._insert_playlist_item}
+        for call in calls:
+            functions[call['call']](**call['args'])
     
     def _track_upload_analytics(self, upload_result: Dict, channel_id: str):
         """Track upload for analytics and optimization"""
         
-        analytics_data = self._load_analytics()
-        
         upload_record = {
             'video_id': upload_result.get('id'),
             'channel_id': channel_id,
@@ -415,12 +668,16 @@ class YouTubeAutomator:
             'status': 'uploaded'
         }
         
-        if channel_id not in analytics_data:
-            analytics_data[channel_id] = []
-        
-        analytics_data[channel_id].append(upload_record)
-        
-        self._save_analytics(analytics_data)
+        # Read-modify-write of one JSON file: one upload at a time
+        with self._analytics_lock:
+            analytics_data = self._load_analytics()
+            
+            if channel_id not in analytics_data:
+                analytics_data[channel_id] = []
+            
+            analytics_data[channel_id].append(upload_record)
+            
+            self._save_analytics(analytics_data)
     
     def _load_analytics(self) -> Dict:
         """Load analytics data"""
@@ -434,9 +691,12 @@ class YouTubeAutomator:
     
     def _save_analytics(self, data: Dict):
         """Save analytics data"""
+        # Write-then-rename so readers never see a half-written file
+        temp_path = f"{self.analytics_file}.{os.getpid()}.tmp"
         try:
-            with open(self.analytics_file, 'w') as f:
+            with open(temp_path, 'w') as f:
                 json.dump(data, f, indent=2)
+            os.replace(temp_path, self.analytics_file)
         except Exception as e:
             print(f"⚠️  Failed to save analytics: {e}")
     
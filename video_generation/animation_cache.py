@@ -0,0 +1,63 @@
+"""
+Animation Cache - Precomputed frames for looping effects
+
+This module:
+- Renders one cycle of a periodic effect at the output frame rate, once
+- Replays the cycle by frame index instead of recomputing every frame
+- Splits RGBA frames into a moviepy clip plus its mask
+"""
+
+from typing import Callable, List
+
+import numpy as np
+from moviepy.video.VideoClip import VideoClip
+from PIL import Image
+
+class PeriodicAnimation:
+    def __init__(self, render_frame: Callable[[float], np.ndarray], period: float, fps: int):
+        """
+        render_frame: returns the RGB or RGBA frame of the effect at time t
+        period: seconds after which the effect repeats itself exactly
+        fps: frame rate the clip will be written at; frames are sampled on that grid
+        """
+        self.period = period
+        self.fps = fps
+
+        frame_count = max(1, int(round(period * fps)))
+        frames = [np.asarray(render_frame(index / fps)) for index in range(frame_count)]
+
+        self._rgb: List[np.ndarray] = [frame[:, :, :3] for frame in frames]
+        self._alpha: List[np.ndarray] = []
+        if frames[0].ndim == 3 and frames[0].shape[2] == 4:
+            self._alpha = [frame[:, :, 3].astype(np.float32) / 255.0 for frame in frames]
+
+    def __len__(self) -> int:
+        return len(self._rgb)
+
+    def index_at(self, t: float) -> int:
+        """Position of time t within the cycle"""
+        return int(round(t * self.fps)) % len(self._rgb)
+
+    def make_clip(self, duration: float) -> VideoClip:
+        """moviepy clip replaying the cycle for duration seconds (masked when frames are RGBA)"""
+
+        clip = VideoClip(make_frame=lambda t: self._rgb[self.index_at(t)], duration=duration)
+
+        if self._alpha:
+            clip.mask = VideoClip(make_frame=lambda t: self._alpha[self.index_at(t)],
+                                  ismask=True, duration=duration)
+
+        return clip
+
+def zoom_animation(sprite: np.ndarray, scale_at: Callable[[float], float], period: float,
+                   fps: int) -> PeriodicAnimation:
+    """Periodic zoom of a sprite; scale_at(t) gives the size factor at time t"""
+
+    image = Image.fromarray(sprite)
+
+    def render_frame(t: float) -> np.ndarray:
+        scale = scale_at(t)
+        size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+        return np.array(image.resize(size, Image.LANCZOS))
+
+    return PeriodicAnimation(render_frame, period, fps)
@@ -0,0 +1,114 @@
+"""
+Background Engine - Vectorized renderer for the animated-shape backgrounds
+
+This module:
+- Draws each frame into one preallocated uint8 NumPy buffer
+- Precomputes the alpha masks of the moving circles once per clip
+- Blends shapes in place on the frame, touching only the pixels they cover
+- Exposes the result as a regular moviepy VideoClip
+"""
+
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from moviepy.video.VideoClip import VideoClip
+
+class AnimatedBackgroundRenderer:
+    def __init__(self, bg_color: Tuple[int, int, int], shape_color: Tuple[int, int, int],
+                 size: Tuple[int, int] = (1920, 1080), shape_count: int = 3, shape_alpha: int = 100,
+                 scale: float = 1.0):
+        """scale: factor applied to the 1080p shape sizes and motion path"""
+        self.width, self.height = size
+        self.scale = scale
+
+        # Solid background copied into the frame buffer at the start of every frame
+        self._background = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self._background[:] = bg_color
+        self._frame = np.empty_like(self._background)
+
+        color = np.array([min(c, 255) for c in shape_color], dtype=np.float32)
+
+        self._shapes = []
+        for index in range(shape_count):
+            diameter = max(1, int(round((200 + index * 50) * scale)))
+            alpha = self._circle_mask(diameter) * (shape_alpha / 255.0)
+
+            self._shapes.append({
+                'index': index,
+                'diameter': diameter,
+                # out = frame * (1 - alpha) + color * alpha
+                'keep': (1.0 - alpha)[:, :, None],
+                'paint': alpha[:, :, None] * color
+            })
+
+        largest = max((shape['diameter'] for shape in self._shapes), default=0)
+        self._scratch = np.empty((largest, largest, 3), dtype=np.float32)
+
+    @staticmethod
+    def _circle_mask(diameter: int) -> np.ndarray:
+        """Filled circle coverage (0 or 1) in a diameter x diameter square"""
+        radius = diameter / 2.0
+        centers = np.arange(diameter, dtype=np.float32) + 0.5 - radius
+        return ((centers[None, :] ** 2 + centers[:, None] ** 2) <= radius ** 2).astype(np.float32)
+
+    def _shape_position(self, shape: Dict, t: float) -> Tuple[int, int]:
+        """Top-left corner of a shape at time t (same motion as the moviepy version)"""
+        x = (100 + (t * 50 + shape['index'] * 200) % 1920) * self.scale
+        y = (200 + shape['index'] * 250) * self.scale
+        return int(x), int(y)
+
+    def _blend(self, shape: Dict, x: int, y: int):
+        """Alpha-blend one shape onto the frame buffer in place"""
+
+        diameter = shape['diameter']
+
+        # Clip the shape rectangle to the frame
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + diameter, self.width), min(y + diameter, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        sx0, sy0 = x0 - x, y0 - y
+        sx1, sy1 = sx0 + (x1 - x0), sy0 + (y1 - y0)
+
+        region = self._frame[y0:y1, x0:x1]
+        scratch = self._scratch[:y1 - y0, :x1 - x0]
+
+        np.multiply(region, shape['keep'][sy0:sy1, sx0:sx1], out=scratch)
+        np.add(scratch, shape['paint'][sy0:sy1, sx0:sx1], out=scratch)
+        np.copyto(region, scratch, casting='unsafe')
+
+    def make_frame(self, t: float) -> np.ndarray:
+        """Render the frame at time t; the returned buffer is reused by the next call"""
+
+        np.copyto(self._frame, self._background)
+
+        for shape in self._shapes:
+            x, y = self._shape_position(shape, t)
+            self._blend(shape, x, y)
+
+        return self._frame
+
+    def make_clip(self, duration: float) -> VideoClip:
+        """Wrap the renderer in a moviepy clip"""
+        return VideoClip(make_frame=self.make_frame, duration=duration)
+
+def measure_fps(clip, frames: int = 90, fps: int = 30) -> float:
+    """Frames per second a clip can produce through get_frame"""
+
+    start = time.perf_counter()
+    for frame_index in range(frames):
+        clip.get_frame((frame_index / fps) % clip.duration)
+    elapsed = time.perf_counter() - start
+
+    return frames / elapsed if elapsed > 0 else float('inf')
+
+def benchmark_backgrounds(clips: Dict[str, VideoClip], frames: int = 90, fps: int = 30) -> List[Dict]:
+    """Compare frame throughput of several background clips"""
+
+    results = []
+    for name, clip in clips.items():
+        results.append({'engine': name, 'frames': frames, 'fps': round(measure_fps(clip, frames, fps), 2)})
+
+    return results
@@ -0,0 +1,117 @@
+"""
+Branding Cache - Per-process store for channel branding assets
+
+This module:
+- Keeps intro frames and shape sprites in memory as NumPy arrays
+- Loads each font once per (file, size) instead of on every video
+- Drops the channel assets when channels_config.json changes on disk
+"""
+
+import os
+import threading
+from typing import Callable, Dict, Hashable, Tuple
+
+import numpy as np
+from PIL import ImageFont
+
+# Stand-ins for the Windows/macOS fonts on systems that don't ship them (most Linux installs)
+FALLBACK_FONTS = {
+    'arial.ttf': 'DejaVuSans.ttf',
+    'arialbd.ttf': 'DejaVuSans-Bold.ttf'
+}
+
+class BrandingAssetCache:
+    def __init__(self, config_path: str = "config/channels_config.json"):
+        self.config_path = config_path
+        self._config_mtime = self._read_mtime()
+        self._assets: Dict[Tuple[str, Hashable], object] = {}
+        self._fonts: Dict[Tuple[str, int], ImageFont.ImageFont] = {}
+        self._missing_fonts = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _read_mtime(self) -> float:
+        try:
+            return os.stat(self.config_path).st_mtime
+        except OSError:
+            return 0.0
+
+    def refresh(self) -> bool:
+        """Clear the channel assets if the config changed since they were built; True when it did"""
+
+        mtime = self._read_mtime()
+        if mtime == self._config_mtime:
+            return False
+
+        with self._lock:
+            self._config_mtime = mtime
+            self._assets.clear()
+
+        return True
+
+    def get(self, kind: str, key: Hashable, build: Callable[[], object]) -> object:
+        """Return the asset stored under (kind, key), building it on first use"""
+
+        with self._lock:
+            asset = self._assets.get((kind, key))
+
+        if asset is not None:
+            self.hits += 1
+            return asset
+
+        self.misses += 1
+        asset = build()
+
+        # Arrays are shared by every clip built from them
+        if isinstance(asset, np.ndarray):
+            asset.setflags(write=False)
+
+        with self._lock:
+            return self._assets.setdefault((kind, key), asset)
+
+    def font(self, name: str, size: int) -> ImageFont.ImageFont:
+        """
+        TrueType font at size; a missing file is replaced by its FALLBACK_FONTS entry,
+        then by PIL's default font scaled to size (with a warning per missing file)
+        """
+
+        key = (name, size)
+        font = self._fonts.get(key)
+
+        if font is None:
+            font = self._load_font(name, size)
+            self._fonts[key] = font
+
+        return font
+
+    def _load_font(self, name: str, size: int) -> ImageFont.ImageFont:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            pass
+
+        fallback = FALLBACK_FONTS.get(os.path.basename(name).lower(), 'DejaVuSans.ttf')
+        try:
+            font = ImageFont.truetype(fallback, size)
+            self._warn_missing_font(name, f"Font {name} not found, using {fallback}")
+            return font
+        except OSError:
+            pass
+
+        self._warn_missing_font(name, f"Font {name} and {fallback} not found, using PIL's default font")
+        try:
+            # Pillow >= 10.1 scales its built-in font; older versions only have the tiny bitmap one
+            return ImageFont.load_default(size=size)
+        except TypeError:
+            return ImageFont.load_default()
+
+    def _warn_missing_font(self, name: str, message: str):
+        """Print message the first time name turns out to be missing"""
+        if name not in self._missing_fonts:
+            self._missing_fonts.add(name)
+            print(f"⚠️  {message}")
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for reporting"""
+        return {'hits': self.hits, 'misses': self.misses, 'assets': len(self._assets), 'fonts': len(self._fonts)}
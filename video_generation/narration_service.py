@@ -0,0 +1,126 @@
+"""
+Narration Service - Parallel text-to-speech for long scripts
+
+This module:
+- Splits scripts on their [HOOK] / [INTRO] / [SECTION n] / [OUTRO] markers
+- Synthesizes every section in its own worker process with its own TTS engine
+- Joins the section WAVs back together in script order
+"""
+
+import os
+import re
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import pyttsx3
+
+# Top-level blocks written by AIScriptGenerator._generate_detailed_script
+SECTION_MARKER = re.compile(r'^[ \t]*\[(?:HOOK|INTRO|SECTION \d+|OUTRO)\b', re.MULTILINE)
+
+def split_script_sections(script: str) -> List[str]:
+    """Split a script into its marked sections, keeping any preamble as the first one"""
+
+    starts = [match.start() for match in SECTION_MARKER.finditer(script)]
+
+    if not starts or starts[0] != 0:
+        starts = [0] + starts
+
+    ends = starts[1:] + [len(script)]
+
+    return [script[start:end] for start, end in zip(starts, ends)]
+
+def join_wav_files(part_paths: List[str], output_path: str, gap_seconds: float = 0.0) -> str:
+    """Concatenate WAV files with identical formats into output_path, optionally with silence between"""
+
+    with wave.open(output_path, 'wb') as output:
+        params = None
+
+        for path in part_paths:
+            with wave.open(path, 'rb') as part:
+                part_params = (part.getnchannels(), part.getsampwidth(), part.getframerate())
+
+                if params is None:
+                    params = part_params
+                    output.setnchannels(params[0])
+                    output.setsampwidth(params[1])
+                    output.setframerate(params[2])
+                elif part_params != params:
+                    raise ValueError(f"WAV format mismatch in {path}: {part_params} != {params}")
+                elif gap_seconds > 0:
+                    gap_frames = int(params[2] * gap_seconds)
+                    output.writeframes(b'\x00' * gap_frames * params[0] * params[1])
+
+                output.writeframes(part.readframes(part.getnframes()))
+
+    return output_path
+
+# Per-process TTS engine used by the narration pool
+_worker_engine = None
+
+def _init_tts_worker():
+    """Give each worker process its own TTS engine"""
+    global _worker_engine
+    _worker_engine = pyttsx3.init()
+
+def _synthesize_in_worker(text: str, voice_id: Optional[str], rate: int, output_path: str) -> str:
+    """Process pool entry point: speak one section into a WAV file"""
+
+    _worker_engine.setProperty('rate', rate)
+    if voice_id:
+        _worker_engine.setProperty('voice', voice_id)
+
+    _worker_engine.save_to_file(text, output_path)
+    _worker_engine.runAndWait()
+
+    return output_path
+
+class NarrationService:
+    def __init__(self, workers: int = 4):
+        self.workers = max(1, workers)
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Started lazily and kept alive so engines are initialized once per worker
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_tts_worker)
+        return self._executor
+
+    def synthesize_parts(self, texts: List[str], voice_id: Optional[str], rate: int,
+                         part_paths: List[str]) -> List[str]:
+        """Speak every text into its own WAV on the pool"""
+
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_synthesize_in_worker, text, voice_id, rate, path)
+            for text, path in zip(texts, part_paths)
+        ]
+
+        # Wait in script order; a failed part fails the whole narration
+        for future in futures:
+            future.result()
+
+        return part_paths
+
+    def synthesize(self, sections: List[str], voice_id: Optional[str], rate: int, output_path: str) -> str:
+        """Speak every section on the pool and join the results into output_path"""
+
+        base_path = os.path.splitext(output_path)[0]
+        part_paths = [f"{base_path}_part{index:03d}.wav" for index in range(len(sections))]
+
+        self.synthesize_parts(sections, voice_id, rate, part_paths)
+
+        try:
+            join_wav_files(part_paths, output_path)
+        finally:
+            for path in part_paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+        return output_path
+
+    def close(self):
+        """Shut down the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,120 @@
+"""
+Segment Cache - Content-addressed store for rendered video segments
+
+This module:
+- Stores encoded segments under a hash of everything that shapes their pixels
+- Hands cached segments back so they can be stitched in without re-encoding
+- Keeps the cache directory under a size budget with LRU eviction
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from typing import Dict, Optional
+
+class SegmentCache:
+    def __init__(self, cache_dir: str = "cache/segments", max_bytes: int = 2 * 1024 ** 3,
+                 extension: str = ".mp4"):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(inputs: Dict) -> str:
+        """Hash the inputs of a segment into a stable cache key"""
+        payload = json.dumps(inputs, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{self.extension}")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached segment path for key, or None on a miss"""
+
+        path = self._path_for(key)
+
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+
+        # Refresh the entry's position in the LRU order
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return path
+
+    def fetch(self, key: str, destination: str) -> bool:
+        """Place the cached segment at destination; False on a miss"""
+
+        path = self.get(key)
+        if path is None:
+            return False
+
+        # A hard link is free and keeps the file alive even if it is evicted meanwhile
+        try:
+            os.link(path, destination)
+        except OSError:
+            shutil.copyfile(path, destination)
+
+        return True
+
+    def put(self, key: str, source_path: str):
+        """Store a freshly rendered segment and evict old entries if over budget"""
+
+        path = self._path_for(key)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        try:
+            shutil.copyfile(source_path, temp_path)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️  Failed to cache segment {key[:12]}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits max_bytes"""
+
+        entries = []
+        total_bytes = 0
+
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(self.extension):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+
+        if total_bytes <= self.max_bytes:
+            return
+
+        entries.sort()
+
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total_bytes -= size
+            except OSError:
+                pass
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for reporting"""
+        return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,88 @@
+"""
+Text Renderer - In-process text rasterization for video overlays
+
+This module:
+- Draws text with PIL's ImageDraw instead of spawning ImageMagick for every TextClip
+- Returns tightly cropped RGBA arrays ready to become moviepy ImageClips
+- Keeps rendered strings in an LRU keyed by (text, font, size, colour)
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import numpy as np
+from moviepy.editor import ImageClip
+from PIL import Image, ImageDraw
+
+from video_generation.branding_cache import BrandingAssetCache
+
+# ImageMagick font names used by the old TextClips -> TrueType files (BrandingAssetCache.font substitutes missing ones)
+FONT_FILES = {
+    'Arial': 'arial.ttf',
+    'Arial-Bold': 'arialbd.ttf'
+}
+
+class TextRenderer:
+    def __init__(self, fonts: BrandingAssetCache, max_entries: int = 256, padding: int = 4):
+        """
+        fonts: supplies (and caches) the loaded font objects
+        max_entries: rendered strings kept before the least recently used is dropped
+        padding: transparent border in pixels around the text
+        """
+        self.fonts = fonts
+        self.max_entries = max(1, max_entries)
+        self.padding = padding
+        self._cache: "OrderedDict[Tuple[str, str, int, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text: str, font: str = 'Arial', size: int = 40, color: str = 'white') -> np.ndarray:
+        """Rasterize text to a read-only (height, width, 4) uint8 array"""
+
+        key = (text, font, size, color)
+
+        with self._lock:
+            image = self._cache.get(key)
+            if image is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return image
+
+        self.misses += 1
+        image = self._rasterize(text, font, size, color)
+
+        with self._lock:
+            self._cache[key] = image
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        return image
+
+    def _rasterize(self, text: str, font: str, size: int, color: str) -> np.ndarray:
+        pil_font = self.fonts.font(FONT_FILES.get(font, font), size)
+
+        # Size the canvas to the inked area so positions match a cropped text label
+        left, top, right, bottom = ImageDraw.Draw(Image.new('L', (1, 1))).textbbox((0, 0), text, font=pil_font)
+        width = max(1, right - left) + 2 * self.padding
+        height = max(1, bottom - top) + 2 * self.padding
+
+        canvas = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+        ImageDraw.Draw(canvas).text(
+            (self.padding - left, self.padding - top), text, fill=color, font=pil_font
+        )
+
+        image = np.array(canvas)
+        image.setflags(write=False)
+        return image
+
+    def make_clip(self, text: str, font: str = 'Arial', size: int = 40, color: str = 'white',
+                  duration: float = None) -> ImageClip:
+        """ImageClip of the rendered text with its alpha channel as mask (drop-in for TextClip)"""
+        return ImageClip(self.render(text, font, size, color), duration=duration, transparent=True)
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for reporting"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._cache)}
@@ -0,0 +1,32 @@
+"""
+TTS Cache - Persistent store of synthesized narration utterances
+
+This module:
+- Keys every utterance on its normalized text, voice id and speaking rate
+- Keeps the synthesized PCM (WAV) on disk so boilerplate lines are spoken once
+- Reuses the segment cache's size-bounded LRU eviction
+"""
+
+import re
+import unicodedata
+from typing import Optional
+
+from video_generation.segment_cache import SegmentCache
+
+class NarrationCache(SegmentCache):
+    def __init__(self, cache_dir: str = "cache/tts", max_bytes: int = 512 * 1024 ** 2):
+        super().__init__(cache_dir, max_bytes, extension=".wav")
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Collapse the differences that don't change what the engine says"""
+        text = unicodedata.normalize('NFC', text)
+        return re.sub(r'\s+', ' ', text).strip()
+
+    def utterance_key(self, text: str, voice_id: Optional[str], rate: int) -> str:
+        """Cache key for one utterance spoken with a given voice and rate"""
+        return self.make_key({
+            'text': self.normalize_text(text),
+            'voice_id': voice_id or '',
+            'rate': rate
+        })
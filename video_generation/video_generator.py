@@ -9,28 +9,120 @@ This module:
 - Optimizes for high watch time and engagement
 """
 
+import errno
 import json
 import os
+import shutil
+import subprocess
 import requests
 from moviepy.editor import (
-    VideoFileClip, ImageClip, TextClip, ColorClip, CompositeVideoClip, 
-    AudioFileClip, CompositeAudioClip, concatenate_videoclips, AudioClip
+    VideoFileClip, ImageClip, ColorClip, CompositeVideoClip, 
+    AudioFileClip, CompositeAudioClip
 )
 from moviepy.video.VideoClip import VideoClip
+from moviepy.audio.fx.audio_loop import audio_loop
+from moviepy.config import get_setting
+import numpy as np
 import pyttsx3
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import random
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Generator, List, Optional, Tuple
 import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import resource  # POSIX only; memory budgets are skipped elsewhere
+except ImportError:
+    resource = None
+
+from pipeline.growing_file import GrowingFile
+from video_generation.segment_cache import SegmentCache
+from video_generation.branding_cache import BrandingAssetCache
+from video_generation.text_renderer import TextRenderer
+from video_generation.animation_cache import zoom_animation
+from video_generation.background_engine import AnimatedBackgroundRenderer, benchmark_backgrounds
+from video_generation.narration_service import NarrationService, join_wav_files, split_script_sections
+from video_generation.tts_cache import NarrationCache
+from video_generation.audio_mixer import AudioMixer, benchmark_mix, write_wav
+
+# Named output settings; layout coordinates are authored for 1080p and scaled to the profile
+RENDER_PROFILES = {
+    'draft': {  # Timing and layout checks
+        'width': 854, 'height': 480, 'fps': 10, 'preset': 'ultrafast', 'crf': 30,
+        'thumbnail_width': 640, 'thumbnail_height': 360
+    },
+    'review': {  # Watchable QA pass
+        'width': 1280, 'height': 720, 'fps': 24, 'preset': 'veryfast', 'crf': 26,
+        'thumbnail_width': 1280, 'thumbnail_height': 720
+    },
+    'publish': {  # Upload quality
+        'width': 1920, 'height': 1080, 'fps': 30, 'preset': 'medium', 'crf': 23,
+        'thumbnail_width': 1280, 'thumbnail_height': 720
+    }
+}
 
 class VideoGenerator:
-    def __init__(self, config_path: str = "config/channels_config.json"):
+    # Segment types whose frames never change over time (solid background + fixed text)
+    STATIC_SEGMENT_TYPES = {'intro', 'text_overlay', 'outro'}
+    
+    # Bump whenever segment drawing changes so stale cached segments stop matching
+    SEGMENT_CACHE_VERSION = 4
+    
+    def __init__(self, config_path: str = "config/channels_config.json", enable_tts: bool = True):
+        self.config_path = config_path
         with open(config_path, 'r') as f:
             self.config = json.load(f)
         
-        # Initialize text-to-speech engine
-        self.tts_engine = pyttsx3.init()
-        self.setup_tts_voices()
+        # Initialize text-to-speech engine (render workers only draw frames and skip it)
+        self.tts_engine = None
+        if enable_tts:
+            self.tts_engine = pyttsx3.init()
+            self.setup_tts_voices()
+        
+        settings = self.config.get('global_settings', {})
+        
+        # Render profile used when a call doesn't pick one
+        self.default_profile = settings.get('render_profile', 'publish')
+        
+        # Video-parallel batches (1 = batch_generate_videos renders one video at a time)
+        self.batch_workers = settings.get('batch_workers', 1)
+        self.batch_memory_limit_mb = settings.get('batch_memory_limit_mb', 0)
+        
+        # Segment-parallel rendering (1 = encode segments one after another)
+        self.render_workers = settings.get('render_workers', 1)
+        
+        # Section-parallel narration (1 = whole script on the shared engine)
+        self.narration_workers = settings.get('narration_workers', 1)
+        self.narration_service = NarrationService(self.narration_workers) if self.narration_workers > 1 else None
+        
+        # Narration + music mix done in NumPy before the final mux
+        self.audio_mixer = AudioMixer(
+            music_gain=settings.get('music_gain', 0.2),
+            duck_gain=settings.get('music_duck_gain', 0.5)
+        )
+        
+        # Synthesized utterances are reused across videos (0 MB disables the cache)
+        tts_cache_mb = settings.get('tts_cache_max_mb', 512)
+        self.tts_cache = None
+        if enable_tts and tts_cache_mb > 0:
+            self.tts_cache = NarrationCache(
+                settings.get('tts_cache_dir', 'cache/tts'), tts_cache_mb * 1024 * 1024
+            )
+        
+        # Rendered segments are reused across videos (0 MB disables the cache)
+        cache_mb = settings.get('segment_cache_max_mb', 2048)
+        self.segment_cache = None
+        if cache_mb > 0:
+            self.segment_cache = SegmentCache(
+                settings.get('segment_cache_dir', 'cache/segments'), cache_mb * 1024 * 1024
+            )
+        
+        # Intro frames, shape sprites and fonts stay in memory until the config changes
+        self.branding_cache = BrandingAssetCache(config_path)
+        
+        # Overlay text drawn with PIL in process; rendered strings kept in an LRU
+        self.text_renderer = TextRenderer(self.branding_cache, settings.get('text_cache_entries', 256))
         
         # Directories for assets
         self.assets_dir = "assets"
@@ -63,69 +155,208 @@ class VideoGenerator:
             'motivation': {'rate': 175, 'voice_index': 0}  # Powerful male
         }
     
-    def generate_video(self, script_data: Dict, channel_id: str) -> str:
+    def generate_video(self, script_data: Dict, channel_id: str, render_workers: Optional[int] = None,
+                       profile: Optional[str] = None,
+                       stream_to: Optional[Callable[[Dict], None]] = None,
+                       video_id: Optional[str] = None) -> str:
         """
         Generate a complete video from script data
         Returns path to generated video file
+        render_workers > 1 encodes the segments on a process pool
+        profile names an entry of RENDER_PROFILES (defaults to global_settings.render_profile)
+        video_id names the temp and output files (defaults to a fresh unique id)
+        stream_to is called with the video info as soon as the final file starts being
+        written; its 'video_stream' (a GrowingFile) can be read while encoding goes on
         """
+        self._reload_config_if_changed()
+        
         channel = self.config['channels'][channel_id]
-        video_id = f"{channel_id}_{int(time.time())}"
+        video_id = video_id or self.new_video_id(channel_id)
+        render_profile = self.get_render_profile(profile)
         
-        print(f"🎬 Generating video for {channel['name']}...")
+        print(f"🎬 Generating video for {channel['name']} ({render_profile['name']} profile)...")
         
         # Step 1: Generate audio narration
         audio_path = self._generate_narration(script_data['script'], channel, video_id)
         
-        # Step 2: Create visual content
-        visual_clips = self._create_visual_content(script_data, channel, video_id)
+        # Step 2: Plan visual content
+        segments = self._plan_visual_segments(script_data, channel)
         
         # Step 3: Add background music
         music_path = self._select_background_music(channel)
         
         # Step 4: Create thumbnail
-        thumbnail_path = self._generate_thumbnail(script_data, channel, video_id)
+        thumbnail_path = self._generate_thumbnail(script_data, channel, video_id, render_profile)
         
-        # Step 5: Compile final video
-        final_video_path = self._compile_video(
-            visual_clips, audio_path, music_path, channel, video_id
-        )
-        
-        print(f"✅ Video generated: {final_video_path}")
-        
-        return {
-            'video_path': final_video_path,
+        video_info = {
             'thumbnail_path': thumbnail_path,
-            'duration': self._get_video_duration(final_video_path),
+            # Known from the plan; the audio is cut to it, so no need to reopen the file
+            'duration': sum(segment['duration'] for segment in segments),
             'title': script_data['title'],
             'description': script_data['description'],
-            'tags': script_data['tags']
+            'tags': script_data['tags'],
+            'profile': render_profile['name']
         }
+        
+        stream = None
+        
+        def start_streaming(output_path: str):
+            nonlocal stream
+            stream = GrowingFile(output_path)
+            stream_to(dict(video_info, video_path=output_path, video_stream=stream))
+        
+        # Step 5: Compile final video
+        try:
+            final_video_path = self._compile_video(
+                segments, audio_path, music_path, channel, video_id, render_profile,
+                render_workers=render_workers or self.render_workers,
+                on_output_started=start_streaming if stream_to else None
+            )
+        except Exception as e:
+            if stream:
+                stream.fail(e)
+            raise
+        
+        if stream:
+            stream.finish()
+        
+        print(f"✅ Video generated: {final_video_path}")
+        
+        video_info['video_path'] = final_video_path
+        return video_info
+    
+    @staticmethod
+    def new_video_id(channel_id: str) -> str:
+        """Unique id for a render: renders of one channel may start in the same second"""
+        return f"{channel_id}_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+    
+    def _reload_config_if_changed(self):
+        """Pick up edits to channels_config.json; the branding cache drops its assets with it"""
+        
+        if self.branding_cache.refresh():
+            with open(self.config_path, 'r') as f:
+                self.config = json.load(f)
+    
+    def get_render_profile(self, name: Optional[str] = None) -> Dict:
+        """Settings of a named render profile, with the name included"""
+        
+        name = name or self.default_profile
+        if name not in RENDER_PROFILES:
+            raise ValueError(f"Unknown render profile '{name}' (choose from {', '.join(RENDER_PROFILES)})")
+        
+        return dict(RENDER_PROFILES[name], name=name)
+    
+    def _scaled(self, value: float, profile: Dict) -> int:
+        """Scale a 1080p layout value (position, size, font size) to the profile's frame height"""
+        return max(1, int(round(value * profile['height'] / 1080)))
     
     def _generate_narration(self, script: str, channel: Dict, video_id: str) -> str:
         """Generate high-quality narration from script"""
         
         # Configure voice for channel type
-        voice_config = self.voice_config.get(channel['niche'], self.voice_config['lifestyle'])
+        voice_id, rate = self._resolve_voice(channel)
+        audio_path = os.path.join(self.temp_dir, f"{video_id}_narration.wav")
+        
+        # Build the track from cached utterances, synthesizing only the misses
+        if self.tts_cache:
+            utterances = self._script_utterances(script)
+            if utterances:
+                return self._generate_cached_narration(utterances, voice_id, rate, audio_path)
+        
+        # Speak the script sections side by side when a narration pool is configured
+        if self.narration_service:
+            sections = [self._clean_script_for_tts(section) for section in split_script_sections(script)]
+            sections = [section for section in sections if section]
+            
+            if len(sections) > 1:
+                return self.narration_service.synthesize(sections, voice_id, rate, audio_path)
         
         # Set voice properties
-        self.tts_engine.setProperty('rate', voice_config['rate'])
-        voices = self.tts_engine.getProperty('voices')
-        if voices and len(voices) > voice_config['voice_index']:
-            self.tts_engine.setProperty('voice', voices[voice_config['voice_index']].id)
+        self.tts_engine.setProperty('rate', rate)
+        if voice_id:
+            self.tts_engine.setProperty('voice', voice_id)
         
         # Clean script for TTS
         clean_script = self._clean_script_for_tts(script)
         
         # Generate audio file
-        audio_path = os.path.join(self.temp_dir, f"{video_id}_narration.wav")
         self.tts_engine.save_to_file(clean_script, audio_path)
         self.tts_engine.runAndWait()
         
         return audio_path
     
+    def _generate_cached_narration(self, utterances: List[str], voice_id: Optional[str], rate: int,
+                                   audio_path: str) -> str:
+        """Join per-utterance WAVs from the TTS cache, speaking only the ones not seen before"""
+        
+        base_path = os.path.splitext(audio_path)[0]
+        part_paths = []
+        local_paths = {}  # key -> temp path of the utterance for this track
+        missing = {}  # key -> (text, temp path)
+        
+        for text in utterances:
+            key = self.tts_cache.utterance_key(text, voice_id, rate)
+            
+            if key not in local_paths:
+                local_path = f"{base_path}_utt{len(local_paths):04d}.wav"
+                local_paths[key] = local_path
+                
+                # Hits are taken out of the cache first, so evictions (ours below, or another
+                # worker's) can't delete them before the join reads them
+                if not self.tts_cache.fetch(key, local_path):
+                    missing[key] = (text, local_path)
+            
+            part_paths.append(local_paths[key])
+        
+        print(f"🗣️ TTS cache: {len(utterances) - len(missing)}/{len(utterances)} utterances reused")
+        
+        if missing:
+            texts = [text for text, _ in missing.values()]
+            paths = [path for _, path in missing.values()]
+            
+            if self.narration_service and len(missing) > 1:
+                self.narration_service.synthesize_parts(texts, voice_id, rate, paths)
+            else:
+                self.tts_engine.setProperty('rate', rate)
+                if voice_id:
+                    self.tts_engine.setProperty('voice', voice_id)
+                for text, path in zip(texts, paths):
+                    self.tts_engine.save_to_file(text, path)
+                self.tts_engine.runAndWait()
+            
+            for key, (_, path) in missing.items():
+                self.tts_cache.put(key, path)
+        
+        try:
+            # Short pause where the lines used to be joined with a space
+            join_wav_files(part_paths, audio_path, gap_seconds=0.15)
+        finally:
+            for path in local_paths.values():
+                if os.path.exists(path):
+                    os.remove(path)
+        
+        return audio_path
+    
+    def _resolve_voice(self, channel: Dict) -> Tuple[Optional[str], int]:
+        """Voice id and speaking rate configured for the channel's niche"""
+        
+        voice_config = self.voice_config.get(channel['niche'], self.voice_config['lifestyle'])
+        
+        voice_id = None
+        voices = self.tts_engine.getProperty('voices')
+        if voices and len(voices) > voice_config['voice_index']:
+            voice_id = voices[voice_config['voice_index']].id
+        
+        return voice_id, voice_config['rate']
+    
     def _clean_script_for_tts(self, script: str) -> str:
         """Clean script for better TTS output"""
         
+        return ' '.join(self._script_utterances(script))
+    
+    def _script_utterances(self, script: str) -> List[str]:
+        """Spoken lines of the script, stripped of stage directions and formatting"""
+        
         # Remove stage directions and formatting
         lines = script.split('\n')
         clean_lines = []
@@ -149,17 +380,24 @@ class VideoGenerator:
             if line and len(line) > 3:
                 clean_lines.append(line)
         
-        return ' '.join(clean_lines)
+        return clean_lines
     
-    def _create_visual_content(self, script_data: Dict, channel: Dict, video_id: str) -> List:
-        """Create visual content clips for the video"""
+    def _plan_visual_segments(self, script_data: Dict, channel: Dict) -> List[Dict]:
+        """
+        Describe every visual clip of the video as a plain dict
+        Segments are picklable, so render workers can rebuild the clips themselves
+        """
         
-        visual_clips = []
+        segments = []
         target_duration = channel['video_length_minutes'] * 60
         
         # Introduction clip with channel branding
-        intro_clip = self._create_intro_clip(channel, 3)  # 3 seconds
-        visual_clips.append(intro_clip)
+        segments.append({'type': 'intro', 'duration': 3, 'fade_out': 0.5})  # 3 seconds
+        
+        # Key points shown on the text overlay segments
+        key_points = self._extract_key_points(script_data['script'])
+        if not key_points:
+            key_points = [script_data['title']]
         
         # Main content clips
         remaining_duration = target_duration - 3 - 5  # Minus intro and outro
@@ -169,58 +407,74 @@ class VideoGenerator:
         for i in range(num_segments):
             # Create diverse visual content
             if i % 3 == 0:
-                clip = self._create_text_overlay_clip(script_data, channel, segment_duration)
+                segments.append({'type': 'text_overlay', 'duration': segment_duration, 'key_points': key_points})
             elif i % 3 == 1:
-                clip = self._create_stock_footage_clip(script_data, channel, segment_duration)
+                segments.append({'type': 'stock_footage', 'duration': segment_duration})
             else:
-                clip = self._create_animated_image_clip(script_data, channel, segment_duration)
-            
-            visual_clips.append(clip)
+                segments.append({'type': 'animated_image', 'duration': segment_duration})
         
         # Outro clip with subscribe reminder
-        outro_clip = self._create_outro_clip(channel, 5)  # 5 seconds
-        visual_clips.append(outro_clip)
+        segments.append({'type': 'outro', 'duration': 5})  # 5 seconds
         
-        return visual_clips
+        return segments
+    
+    def _build_segment_clip(self, segment: Dict, channel: Dict, profile: Dict):
+        """Build the moviepy clip for a planned segment at the profile's resolution"""
+        
+        segment_type = segment['type']
+        duration = segment['duration']
+        
+        if segment_type == 'intro':
+            return self._create_intro_clip(channel, duration, profile, segment.get('fade_out', 0))
+        if segment_type == 'text_overlay':
+            return self._create_text_overlay_clip(segment['key_points'], channel, duration, profile)
+        if segment_type == 'stock_footage':
+            return self._create_stock_footage_clip(channel, duration, profile)
+        if segment_type == 'animated_image':
+            return self._create_animated_image_clip(channel, duration, profile)
+        if segment_type == 'outro':
+            return self._create_outro_clip(channel, duration, profile)
+        
+        raise ValueError(f"Unknown segment type: {segment_type}")
     
-    def _create_intro_clip(self, channel: Dict, duration: int) -> VideoFileClip:
+    def _create_intro_clip(self, channel: Dict, duration: int, profile: Dict, fade_out: float = 0.5) -> VideoFileClip:
         """Create engaging intro clip"""
         
-        # Create intro image with channel branding
-        intro_img = self._create_intro_image(channel)
-        intro_path = os.path.join(self.temp_dir, f"intro_{channel['name']}.png")
-        intro_img.save(intro_path)
+        # Intro image with channel branding, drawn once per channel and resolution
+        intro_frame = self.branding_cache.get(
+            'intro', (channel['name'], channel['niche'], profile['width'], profile['height']),
+            lambda: np.array(self._create_intro_image(channel, profile))
+        )
         
         # Create video clip from image
-        intro_clip = ImageClip(intro_path, duration=duration)
+        intro_clip = ImageClip(intro_frame, duration=duration)
         
         # Add fade in/out effects
-        intro_clip = intro_clip.fadeout(0.5)
+        if fade_out:
+            intro_clip = intro_clip.fadeout(fade_out)
         
         return intro_clip
     
-    def _create_intro_image(self, channel: Dict) -> Image.Image:
+    def _create_intro_image(self, channel: Dict, profile: Dict) -> Image.Image:
         """Create intro image with channel branding"""
         
+        width, height = profile['width'], profile['height']
+        
         # Create base image
-        img = Image.new('RGB', (1920, 1080), color=self._get_channel_color(channel))
+        img = Image.new('RGB', (width, height), color=self._get_channel_color(channel))
         draw = ImageDraw.Draw(img)
         
-        # Try to load font, fallback to default if not available
-        try:
-            title_font = ImageFont.truetype("arial.ttf", 80)
-            subtitle_font = ImageFont.truetype("arial.ttf", 40)
-        except:
-            title_font = ImageFont.load_default()
-            subtitle_font = ImageFont.load_default()
+        # Cached fonts, falling back to default if not available
+        title_font = self.branding_cache.font("arial.ttf", self._scaled(80, profile))
+        subtitle_font = self.branding_cache.font("arial.ttf", self._scaled(40, profile))
         
         # Add channel name
         title_text = channel['name']
         title_bbox = draw.textbbox((0, 0), title_text, font=title_font)
         title_width = title_bbox[2] - title_bbox[0]
         title_height = title_bbox[3] - title_bbox[1]
-        title_x = (1920 - title_width) // 2
-        title_y = 400
+        title_x = (width - title_width) // 2
+        title_y = self._scaled(400, profile)
         
         draw.text((title_x, title_y), title_text, fill='white', font=title_font)
         
@@ -237,8 +491,8 @@ class VideoGenerator:
         tagline = taglines.get(channel['niche'], 'Quality Content Daily')
         tagline_bbox = draw.textbbox((0, 0), tagline, font=subtitle_font)
         tagline_width = tagline_bbox[2] - tagline_bbox[0]
-        tagline_x = (1920 - tagline_width) // 2
-        tagline_y = title_y + title_height + 20
+        tagline_x = (width - tagline_width) // 2
+        tagline_y = title_y + title_height + self._scaled(20, profile)
         
         draw.text((tagline_x, tagline_y), tagline, fill='lightgray', font=subtitle_font)
         
@@ -258,24 +512,20 @@ class VideoGenerator:
         
         return colors.get(channel['niche'], (33, 33, 33))
     
-    def _create_text_overlay_clip(self, script_data: Dict, channel: Dict, duration: float) -> CompositeVideoClip:
+    def _create_text_overlay_clip(self, key_points: List[str], channel: Dict, duration: float,
+                                  profile: Dict) -> CompositeVideoClip:
         """Create clip with text overlays and background"""
         
         # Create background color clip
         bg_color = self._get_channel_color(channel)
-        background = ColorClip(size=(1920, 1080), color=bg_color, duration=duration)
-        
-        # Extract key points from script for text overlay
-        key_points = self._extract_key_points(script_data['script'])
-        if not key_points:
-            key_points = [script_data['title']]
+        background = ColorClip(size=(profile['width'], profile['height']), color=bg_color, duration=duration)
         
         text_clips = []
         
         # Main title
-        title_clip = TextClip(
+        title_clip = self.text_renderer.make_clip(
             key_points[0][:50],  # Limit length
-            fontsize=60,
+            size=self._scaled(60, profile),
             color='white',
             font='Arial-Bold'
         ).set_position('center').set_duration(duration)
@@ -285,12 +535,12 @@ class VideoGenerator:
         # Add bullet points if available
         if len(key_points) > 1:
             for i, point in enumerate(key_points[1:4]):  # Max 3 additional points
-                bullet_clip = TextClip(
+                bullet_clip = self.text_renderer.make_clip(
                     f"• {point[:40]}",
-                    fontsize=40,
+                    size=self._scaled(40, profile),
                     color='lightgray',
                     font='Arial'
-                ).set_position(('center', 600 + i * 80)).set_duration(duration)
+                ).set_position(('center', self._scaled(600 + i * 80, profile))).set_duration(duration)
                 
                 text_clips.append(bullet_clip)
         
@@ -318,102 +568,129 @@ class VideoGenerator:
         
         return key_points[:5]  # Return max 5 points
     
-    def _create_stock_footage_clip(self, script_data: Dict, channel: Dict, duration: float) -> VideoFileClip:
+    def _create_stock_footage_clip(self, channel: Dict, duration: float, profile: Dict) -> VideoFileClip:
         """Create clip using stock footage or generated content"""
         
         # For now, create a simple animated background
         # In production, you'd use actual stock footage APIs like Pexels, Unsplash
         
         # Create animated gradient background
-        return self._create_animated_background(channel, duration)
+        return self._create_vectorized_background(channel, duration, profile)
     
-    def _create_animated_background(self, channel: Dict, duration: float) -> CompositeVideoClip:
-        """Create animated background when stock footage isn't available"""
+    def _create_vectorized_background(self, channel: Dict, duration: float, profile: Dict) -> VideoClip:
+        """Animated background drawn by the NumPy engine straight into a frame buffer"""
+        
+        bg_color = self._get_channel_color(channel)
+        shape_color = tuple(c + 30 for c in bg_color)  # Lighter shade
+        
+        size = (profile['width'], profile['height'])
+        scale = profile['height'] / 1080
+        
+        # Circle masks are precomputed by the renderer, so keep one per colour and resolution
+        renderer = self.branding_cache.get(
+            'background', (bg_color, size, scale),
+            lambda: AnimatedBackgroundRenderer(bg_color, shape_color, size=size, scale=scale)
+        )
+        
+        return renderer.make_clip(duration)
+    
+    def _create_animated_background(self, channel: Dict, duration: float, profile: Dict) -> CompositeVideoClip:
+        """
+        Create animated background when stock footage isn't available
+        moviepy compositing version, kept as the baseline for benchmark_background
+        """
         
         # Create base background
         bg_color = self._get_channel_color(channel)
-        background = ColorClip(size=(1920, 1080), color=bg_color, duration=duration)
+        background = ColorClip(size=(profile['width'], profile['height']), color=bg_color, duration=duration)
         
         # Add moving shapes for visual interest
         shapes = []
         
         for i in range(3):
             # Create moving circle
-            circle_clip = self._create_moving_shape('circle', channel, duration, i)
+            circle_clip = self._create_moving_shape('circle', channel, duration, i, profile)
             shapes.append(circle_clip)
         
         return CompositeVideoClip([background] + shapes)
     
-    def _create_moving_shape(self, shape_type: str, channel: Dict, duration: float, index: int) -> VideoClip:
+    def _create_moving_shape(self, shape_type: str, channel: Dict, duration: float, index: int,
+                             profile: Dict) -> VideoClip:
         """Create a moving shape for background animation"""
         
         # Create a simple colored circle
-        size = 200 + index * 50
+        size = self._scaled(200 + index * 50, profile)
         color = [c + 30 for c in self._get_channel_color(channel)]  # Lighter shade
         
-        # Create shape image
-        shape_img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(shape_img)
-        draw.ellipse([0, 0, size, size], fill=tuple(color + [100]))  # Semi-transparent
+        def draw_sprite():
+            shape_img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(shape_img)
+            draw.ellipse([0, 0, size, size], fill=tuple(color + [100]))  # Semi-transparent
+            return np.array(shape_img)
         
-        shape_path = os.path.join(self.temp_dir, f"shape_{index}.png")
-        shape_img.save(shape_path)
+        # Shape sprite as an RGBA array
+        shape_sprite = self.branding_cache.get('shape', (shape_type, tuple(color), size), draw_sprite)
         
         # Create moving clip
-        shape_clip = ImageClip(shape_path, duration=duration, transparent=True)
+        shape_clip = ImageClip(shape_sprite, duration=duration, transparent=True)
         
         # Add movement
+        scale = profile['height'] / 1080
+        
         def position_func(t):
-            x = 100 + (t * 50 + index * 200) % 1920
-            y = 200 + index * 250
+            x = (100 + (t * 50 + index * 200) % 1920) * scale
+            y = (200 + index * 250) * scale
             return (x, y)
         
         shape_clip = shape_clip.set_position(position_func)
         
         return shape_clip
     
-    def _create_animated_image_clip(self, script_data: Dict, channel: Dict, duration: float) -> CompositeVideoClip:
+    def _create_animated_image_clip(self, channel: Dict, duration: float, profile: Dict) -> CompositeVideoClip:
         """Create clip with animated images and text"""
         
         # Create background
         bg_color = self._get_channel_color(channel)
-        background = ColorClip(size=(1920, 1080), color=bg_color, duration=duration)
+        background = ColorClip(size=(profile['width'], profile['height']), color=bg_color, duration=duration)
         
         # Add animated text
-        animated_text = TextClip(
-            "💡 Key Insight",
-            fontsize=50,
-            color='white',
-            font='Arial-Bold'
-        ).set_position('center').set_duration(duration)
-        
-        # Add zoom effect
-        animated_text = animated_text.resize(lambda t: 1 + 0.1 * (t % 2))
+        text = "💡 Key Insight"
+        font_size = self._scaled(50, profile)
+        
+        # Zoom effect: one 2-second cycle of resized frames, replayed by index
+        zoom = self.branding_cache.get(
+            'animation', ('zoom', text, font_size, profile['fps']),
+            lambda: zoom_animation(
+                self.text_renderer.render(text, 'Arial-Bold', font_size, 'white'),
+                lambda t: 1 + 0.1 * (t % 2), period=2, fps=profile['fps']
+            )
+        )
+        animated_text = zoom.make_clip(duration).set_position('center')
         
         return CompositeVideoClip([background, animated_text])
     
-    def _create_outro_clip(self, channel: Dict, duration: int) -> CompositeVideoClip:
+    def _create_outro_clip(self, channel: Dict, duration: int, profile: Dict) -> CompositeVideoClip:
         """Create engaging outro with subscribe reminder"""
         
         # Create outro background
         bg_color = self._get_channel_color(channel)
-        background = ColorClip(size=(1920, 1080), color=bg_color, duration=duration)
+        background = ColorClip(size=(profile['width'], profile['height']), color=bg_color, duration=duration)
         
         # Subscribe reminder text
-        subscribe_text = TextClip(
+        subscribe_text = self.text_renderer.make_clip(
             "👍 LIKE & SUBSCRIBE for more!",
-            fontsize=60,
+            size=self._scaled(60, profile),
             color='white',
             font='Arial-Bold'
         ).set_position('center').set_duration(duration)
         
         # Channel name
-        channel_text = TextClip(
+        channel_text = self.text_renderer.make_clip(
             channel['name'],
-            fontsize=40,
+            size=self._scaled(40, profile),
             color='lightgray',
             font='Arial'
-        ).set_position(('center', 700)).set_duration(duration)
+        ).set_position(('center', self._scaled(700, profile))).set_duration(duration)
         
         return CompositeVideoClip([background, subscribe_text, channel_text])
     
@@ -440,41 +717,43 @@ class VideoGenerator:
         
         if not os.path.exists(placeholder_music):
             # Create 5 seconds of silence as placeholder
-            silent_audio = AudioClip(lambda t: 0, duration=5)
-            silent_audio.write_audiofile(placeholder_music, verbose=False, logger=None)
+            write_wav(placeholder_music, np.zeros((5 * 44100, 2), dtype=np.float32), 44100)
         
         return placeholder_music
     
-    def _generate_thumbnail(self, script_data: Dict, channel: Dict, video_id: str) -> str:
+    def _generate_thumbnail(self, script_data: Dict, channel: Dict, video_id: str, profile: Dict) -> str:
         """Generate eye-catching thumbnail"""
         
+        width, height = profile['thumbnail_width'], profile['thumbnail_height']
+        
+        # Thumbnail layout is authored for 1280x720
+        def scaled(value):
+            return max(1, int(round(value * height / 720)))
+        
         # Create thumbnail image
-        img = Image.new('RGB', (1280, 720), color=self._get_channel_color(channel))
+        img = Image.new('RGB', (width, height), color=self._get_channel_color(channel))
         draw = ImageDraw.Draw(img)
         
-        # Try to load font
-        try:
-            title_font = ImageFont.truetype("arial.ttf", 60)
-        except:
-            title_font = ImageFont.load_default()
+        # Cached font, falling back to default if not available
+        title_font = self.branding_cache.font("arial.ttf", scaled(60))
         
         # Add title text (shortened for thumbnail)
         title = script_data['title'][:40] + "..." if len(script_data['title']) > 40 else script_data['title']
         
         # Add background for text readability
-        text_bg = Image.new('RGBA', (1280, 200), (0, 0, 0, 128))
-        img.paste(text_bg, (0, 260), text_bg)
+        text_bg = Image.new('RGBA', (width, scaled(200)), (0, 0, 0, 128))
+        img.paste(text_bg, (0, scaled(260)), text_bg)
         
         # Add title text
         title_bbox = draw.textbbox((0, 0), title, font=title_font)
         title_width = title_bbox[2] - title_bbox[0]
-        title_x = (1280 - title_width) // 2
+        title_x = (width - title_width) // 2
         
-        draw.text((title_x, 300), title, fill='white', font=title_font)
+        draw.text((title_x, scaled(300)), title, fill='white', font=title_font)
         
         # Add click indicators
-        draw.text((50, 50), "🔥 VIRAL", fill='red', font=title_font)
-        draw.text((1000, 50), "NEW!", fill='yellow', font=title_font)
+        draw.text((scaled(50), scaled(50)), "🔥 VIRAL", fill='red', font=title_font)
+        draw.text((scaled(1000), scaled(50)), "NEW!", fill='yellow', font=title_font)
         
         # Save thumbnail
         thumbnail_path = os.path.join(self.output_dir, f"{video_id}_thumbnail.jpg")
@@ -482,12 +761,207 @@ class VideoGenerator:
         
         return thumbnail_path
     
-    def _compile_video(self, visual_clips: List, audio_path: str, music_path: str, 
-                      channel: Dict, video_id: str) -> str:
-        """Compile all elements into final video"""
+    def _compile_video(self, segments: List[Dict], audio_path: str, music_path: str, 
+                      channel: Dict, video_id: str, profile: Dict, render_workers: int = 1,
+                      on_output_started: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Compile all elements into final video
+        Every segment is encoded to its own file (on a process pool when
+        render_workers > 1), the pieces are joined with ffmpeg's concat demuxer
+        without re-encoding and the audio mix is muxed in once
+        With on_output_started the final file is written as fragmented MP4, which
+        only ever grows, and the callback gets its path as soon as it is created:
+        the muxer then runs while the segments encode and takes each one as it is done
+        """
+        
+        segment_dir = os.path.join(self.temp_dir, f"{video_id}_segments")
+        os.makedirs(segment_dir, exist_ok=True)
+        
+        # Segments and the audio mix are scratch files, removed however the render ends
+        try:
+            # Every piece is encoded with identical settings so the stream-copy join stays valid
+            segment_paths = [
+                os.path.join(segment_dir, f"segment_{index:04d}.mp4") for index in range(len(segments))
+            ]
+            
+            # Mix narration and music once for the whole video (first, so a streaming mux can start)
+            total_duration = sum(segment['duration'] for segment in segments)
+            mixed_audio_path = os.path.join(segment_dir, "audio_mix.wav")
+            self.audio_mixer.mix(audio_path, music_path, total_duration, mixed_audio_path)
+            
+            # Preview renders never overwrite or get mistaken for the upload file
+            suffix = 'final' if profile['name'] == 'publish' else profile['name']
+            output_path = os.path.join(self.output_dir, f"{video_id}_{suffix}.mp4")
+            
+            encoded = self._encode_segments(segments, segment_paths, channel, profile, render_workers)
+            
+            if on_output_started and hasattr(os, 'mkfifo'):
+                self._mux_while_encoding(segment_paths, encoded, segment_dir, mixed_audio_path,
+                                         output_path, on_output_started)
+                return output_path
+            
+            for _ in encoded:
+                pass
+            
+            # Concat demuxer input list
+            concat_list_path = os.path.join(segment_dir, "segments.txt")
+            with open(concat_list_path, 'w') as f:
+                for path in segment_paths:
+                    f.write(f"file '{os.path.abspath(path)}'\n")
+            
+            container_flags = []
+            if on_output_started:
+                # No FIFOs on this platform: the upload can only overlap the final mux
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                container_flags = ['-movflags', 'frag_keyframe+empty_moov', '-f', 'mp4']
+                on_output_started(output_path)
+            
+            self._run_ffmpeg(self._final_mux_args(concat_list_path, mixed_audio_path) + container_flags + [
+                output_path
+            ])
+        finally:
+            shutil.rmtree(segment_dir, ignore_errors=True)
+        
+        return output_path
+    
+    def _encode_segments(self, segments: List[Dict], segment_paths: List[str], channel: Dict,
+                         profile: Dict, render_workers: int = 1) -> Generator[str, None, None]:
+        """Yield every segment path in plan order as soon as its file is complete"""
+        
+        # Cached segments are linked in as-is; only the misses get encoded
+        pending = {}
+        for index, (segment, path) in enumerate(zip(segments, segment_paths)):
+            cache_key = self._segment_cache_key(segment, channel, profile)
+            if self.segment_cache and self.segment_cache.fetch(cache_key, path):
+                continue
+            pending[index] = (segment, path, cache_key)
         
-        # Combine visual clips
-        main_video = concatenate_videoclips(visual_clips)
+        if self.segment_cache:
+            print(f"♻️ Segment cache: {len(segments) - len(pending)}/{len(segments)} segments reused")
+        
+        if render_workers > 1 and len(pending) > 1:
+            print(f"⚡ Rendering {len(pending)} segments on {render_workers} processes...")
+            
+            with ProcessPoolExecutor(max_workers=render_workers, initializer=_init_render_worker,
+                                     initargs=(self.config_path,)) as executor:
+                futures = {
+                    index: executor.submit(_render_segment_in_worker, segment, channel, path, profile)
+                    for index, (segment, path, _) in pending.items()
+                }
+                
+                # Results in plan order; the first failure aborts the render
+                for index, path in enumerate(segment_paths):
+                    if index in futures:
+                        futures[index].result()
+                        self._cache_segment(pending[index])
+                    yield path
+        else:
+            for index, path in enumerate(segment_paths):
+                if index in pending:
+                    segment, _, _ = pending[index]
+                    self._render_segment(segment, channel, path, profile)
+                    self._cache_segment(pending[index])
+                yield path
+    
+    def _cache_segment(self, pending_segment: Tuple[Dict, str, str]):
+        """Store a freshly encoded (segment, path, cache key) in the segment cache"""
+        if self.segment_cache:
+            _, path, cache_key = pending_segment
+            self.segment_cache.put(cache_key, path)
+    
+    def _final_mux_args(self, concat_list_path: str, mixed_audio_path: str) -> List[str]:
+        """ffmpeg inputs and codecs of the final join: segments stream-copied, the audio mix encoded once"""
+        return [
+            '-f', 'concat', '-safe', '0', '-i', concat_list_path,
+            '-i', mixed_audio_path,
+            '-map', '0:v:0', '-map', '1:a:0',
+            '-c:v', 'copy', '-c:a', 'aac',
+            '-shortest'
+        ]
+    
+    def _mux_while_encoding(self, segment_paths: List[str], encoded: Generator[str, None, None],
+                            segment_dir: str, mixed_audio_path: str, output_path: str,
+                            on_output_started: Callable[[str], None]):
+        """
+        Write the final fragmented MP4 while the segments are still being encoded
+        The concat list names one FIFO per segment; the concat demuxer opens each only
+        when it reaches it, so the muxer waits there until that segment is done and fed in
+        """
+        
+        fifo_paths = [os.path.splitext(path)[0] + ".fifo" for path in segment_paths]
+        for fifo_path in fifo_paths:
+            os.mkfifo(fifo_path)
+        
+        concat_list_path = os.path.join(segment_dir, "segments.txt")
+        with open(concat_list_path, 'w') as f:
+            for fifo_path in fifo_paths:
+                f.write(f"file '{os.path.abspath(fifo_path)}'\n")
+        
+        # Readers must never see bytes of an older file under the same name
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        
+        log_path = os.path.join(segment_dir, "mux.log")
+        with open(log_path, 'wb') as log:
+            muxer = subprocess.Popen(
+                [get_setting("FFMPEG_BINARY"), '-y', '-loglevel', 'error']
+                + self._final_mux_args(concat_list_path, mixed_audio_path)
+                # Each fragment reaches the file as it is muxed instead of waiting in ffmpeg's output buffer
+                + ['-flush_packets', '1', '-movflags', 'frag_keyframe+empty_moov', '-f', 'mp4', output_path],
+                stdout=subprocess.DEVNULL, stderr=log
+            )
+        
+        try:
+            on_output_started(output_path)
+            
+            for path, fifo_path in zip(encoded, fifo_paths):
+                self._feed_segment(path, fifo_path, muxer)
+            
+            returncode = muxer.wait()
+        except BaseException:
+            # Stop the output where it is; a streaming reader sees the failure through the caller
+            muxer.kill()
+            muxer.wait()
+            raise
+        finally:
+            encoded.close()
+        
+        if returncode != 0:
+            with open(log_path, 'rb') as log:
+                raise RuntimeError(f"ffmpeg failed: {log.read().decode(errors='replace')[-500:]}")
+    
+    def _feed_segment(self, path: str, fifo_path: str, muxer: subprocess.Popen):
+        """Remux a finished segment into its FIFO once the muxer has opened it"""
+        
+        # Opening a FIFO for writing fails with ENXIO until a reader has it open; polling instead
+        # of blocking notices a muxer that died before it got to this segment
+        while True:
+            try:
+                fd = os.open(fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+                break
+            except OSError as e:
+                if e.errno != errno.ENXIO:
+                    raise
+            
+            if muxer.poll() is not None:
+                raise RuntimeError(f"ffmpeg muxer exited ({muxer.returncode}) before {os.path.basename(path)}")
+            time.sleep(0.02)
+        
+        os.set_blocking(fd, True)
+        with os.fdopen(fd, 'wb') as fifo:
+            # Fragments carry every sample's duration, so the concat demuxer starts the next
+            # segment exactly where this one ends, as it does with the finished files
+            self._run_ffmpeg([
+                '-i', path, '-c', 'copy',
+                '-movflags', 'frag_keyframe+empty_moov+default_base_moof', '-f', 'mp4', 'pipe:1'
+            ], stdout=fifo)
+    
+    def _build_final_audio(self, audio_path: str, music_path: str, duration: float) -> CompositeAudioClip:
+        """
+        Mix narration with background music looped to the video duration
+        moviepy version, kept as the baseline for benchmark_audio_mix
+        """
         
         # Load narration audio
         narration = AudioFileClip(audio_path)
@@ -496,46 +970,157 @@ class VideoGenerator:
         background_music = AudioFileClip(music_path)
         
         # Loop background music to match video duration
-        if background_music.duration < main_video.duration:
-            background_music = background_music.loop(duration=main_video.duration)
+        if background_music.duration < duration:
+            background_music = audio_loop(background_music, duration=duration)
         else:
-            background_music = background_music.subclip(0, main_video.duration)
+            background_music = background_music.subclip(0, duration)
         
         # Mix audio (narration + background music at low volume)
         background_music = background_music.volumex(0.2)  # 20% volume for background
-        final_audio = CompositeAudioClip([narration, background_music])
-        
-        # Set audio to video
-        final_video = main_video.set_audio(final_audio)
-        
-        # Export final video
-        output_path = os.path.join(self.output_dir, f"{video_id}_final.mp4")
-        
-        final_video.write_videofile(
-            output_path,
-            fps=30,
-            codec='libx264',
-            audio_codec='aac',
-            temp_audiofile='temp-audio.m4a',
-            remove_temp=True,
-            verbose=False,
-            logger=None
-        )
+        
+        return CompositeAudioClip([narration, background_music]).set_duration(duration)
+    
+    def _render_segment(self, segment: Dict, channel: Dict, output_path: str, profile: Dict) -> str:
+        """Encode a single planned segment (video only) to output_path"""
+        
+        clip = self._build_segment_clip(segment, channel, profile)
+        
+        if self._is_static_segment(segment):
+            self._render_still_segment(clip, segment, output_path, profile)
+        else:
+            clip.write_videofile(
+                output_path,
+                fps=profile['fps'],
+                codec='libx264',
+                preset=profile['preset'],
+                audio=False,
+                ffmpeg_params=self._segment_encoder_params(profile),
+                verbose=False,
+                logger=None
+            )
+        clip.close()
         
         return output_path
     
-    def _get_video_duration(self, video_path: str) -> float:
-        """Get duration of generated video"""
-        try:
-            clip = VideoFileClip(video_path)
-            duration = clip.duration
-            clip.close()
-            return duration
-        except:
-            return 0.0
+    def _segment_cache_key(self, segment: Dict, channel: Dict, profile: Dict) -> str:
+        """Content hash of everything that determines a segment's encoded bytes"""
+        
+        return SegmentCache.make_key({
+            'version': self.SEGMENT_CACHE_VERSION,
+            'segment': segment,
+            'channel_name': channel['name'],
+            'niche': channel['niche'],
+            'color': self._get_channel_color(channel),
+            'profile': profile,
+            'still': self._is_static_segment(segment),
+            'encoder': self._segment_encoder_params(profile)
+        })
+    
+    def _is_static_segment(self, segment: Dict) -> bool:
+        """True when every frame of the segment is identical (a fade-out is applied by ffmpeg)"""
+        return segment['type'] in self.STATIC_SEGMENT_TYPES
     
-    def batch_generate_videos(self, scripts_list: List[Dict], channel_id: str) -> List[Dict]:
-        """Generate multiple videos in batch"""
+    def _render_still_segment(self, clip, segment: Dict, output_path: str, profile: Dict):
+        """Rasterize a static clip once and encode it as a looped still image"""
+        
+        frame_path = os.path.splitext(output_path)[0] + "_still.png"
+        Image.fromarray(clip.get_frame(0)).save(frame_path)
+        
+        duration = segment['duration']
+        filters = []
+        
+        fade_out = segment.get('fade_out')
+        if fade_out:
+            filters += ['-vf', f"fade=t=out:st={max(duration - fade_out, 0):.3f}:d={fade_out:.3f}"]
+        
+        fps = str(profile['fps'])
+        
+        self._run_ffmpeg(
+            ['-loop', '1', '-framerate', fps, '-i', frame_path, '-t', f"{duration:.3f}"]
+            + filters
+            + ['-c:v', 'libx264', '-preset', profile['preset'], '-tune', 'stillimage', '-r', fps]
+            + self._segment_encoder_params(profile)
+            + [output_path]
+        )
+        
+        os.remove(frame_path)
+    
+    def _segment_encoder_params(self, profile: Dict) -> List[str]:
+        """Encoder settings shared by every segment so the concat join can stream-copy"""
+        
+        return [
+            '-crf', str(profile['crf']),
+            '-pix_fmt', 'yuv420p',
+            # Stills are tuned differently; in-band headers keep each piece decodable after the join
+            '-x264-params', 'repeat-headers=1',
+            '-video_track_timescale', '15360'
+        ]
+    
+    def _run_ffmpeg(self, args: List[str], stdout=subprocess.PIPE):
+        """Run the ffmpeg binary moviepy is configured with (stdout: where its output goes)"""
+        
+        command = [get_setting("FFMPEG_BINARY"), '-y', '-loglevel', 'error'] + args
+        result = subprocess.run(command, stdout=stdout, stderr=subprocess.PIPE)
+        
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {result.stderr.decode(errors='replace')[-500:]}")
+    
+    def benchmark_background(self, channel_id: str = 'channel_1', frames: int = 90) -> List[Dict]:
+        """Frames per second of the moviepy background vs the NumPy engine"""
+        
+        channel = self.config['channels'][channel_id]
+        profile = self.get_render_profile('publish')
+        duration = max(frames / profile['fps'], 1)
+        
+        results = benchmark_backgrounds({
+            'moviepy_composite': self._create_animated_background(channel, duration, profile),
+            'numpy_engine': self._create_vectorized_background(channel, duration, profile)
+        }, frames=frames, fps=profile['fps'])
+        
+        for result in results:
+            print(f"🏁 {result['engine']}: {result['fps']} fps")
+        
+        return results
+    
+    def benchmark_audio_mix(self, narration_path: str, music_path: str, duration: float) -> Dict[str, float]:
+        """Seconds taken to mix and write the audio track: moviepy composite vs NumPy mixer"""
+        
+        def moviepy_mix(output_path):
+            final_audio = self._build_final_audio(narration_path, music_path, duration)
+            final_audio.write_audiofile(output_path, fps=44100, verbose=False, logger=None)
+        
+        def numpy_mix(output_path):
+            self.audio_mixer.mix(narration_path, music_path, duration, output_path)
+        
+        timings = benchmark_mix({
+            'moviepy_composite': moviepy_mix,
+            'numpy_mixer': numpy_mix
+        }, os.path.join(self.temp_dir, "benchmark_mix"))
+        
+        for name, seconds in timings.items():
+            print(f"🏁 {name}: {seconds}s for {duration:.0f}s of audio")
+        
+        return timings
+    
+    def batch_generate_videos(self, scripts_list: List[Dict], channel_id: str,
+                              profile: Optional[str] = None, max_workers: Optional[int] = None,
+                              memory_limit_mb: Optional[int] = None) -> List[Dict]:
+        """
+        Generate multiple videos in batch, all with the same render profile
+        max_workers > 1 renders that many videos at once on a process pool
+        (defaults to global_settings.batch_workers)
+        """
+        
+        # Fail fast on a bad profile name instead of once per video
+        profile = self.get_render_profile(profile)['name']
+        
+        if max_workers is None:
+            max_workers = self.batch_workers
+        
+        if max_workers > 1 and len(scripts_list) > 1:
+            reports = self.generate_videos_in_parallel(scripts_list, channel_id, max_workers,
+                                                       memory_limit_mb, profile)
+            return [report['video'] for report in reports if report['status'] == 'success']
         
         generated_videos = []
         
@@ -543,7 +1128,7 @@ class VideoGenerator:
             print(f"Generating video {i+1}/{len(scripts_list)}...")
             
             try:
-                video_info = self.generate_video(script_data, channel_id)
+                video_info = self.generate_video(script_data, channel_id, profile=profile)
                 generated_videos.append(video_info)
                 
                 print(f"✅ Video {i+1} completed: {video_info['title']}")
@@ -553,6 +1138,103 @@ class VideoGenerator:
                 continue
         
         return generated_videos
+    
+    def generate_videos_in_parallel(self, scripts_list: List[Dict], channel_id: str,
+                                    max_concurrent: Optional[int] = None,
+                                    memory_limit_mb: Optional[int] = None,
+                                    profile: Optional[str] = None) -> List[Dict]:
+        """
+        Render a batch on a process pool, at most max_concurrent videos at a time
+        memory_limit_mb caps the address space of every render process (0/None = no cap)
+        Returns one report per script in input order:
+        {'index', 'title', 'status', 'video', 'error', 'elapsed_seconds'}
+        """
+        
+        profile = self.get_render_profile(profile)['name']
+        
+        if max_concurrent is None:
+            max_concurrent = self.batch_workers
+        max_concurrent = max(1, min(max_concurrent, len(scripts_list) or 1))
+        
+        if memory_limit_mb is None:
+            memory_limit_mb = self.batch_memory_limit_mb
+        
+        print(f"⚡ Rendering {len(scripts_list)} videos on {max_concurrent} worker processes...")
+        
+        reports = [None] * len(scripts_list)
+        
+        with ProcessPoolExecutor(max_workers=max_concurrent, initializer=_init_batch_worker,
+                                 initargs=(self.config_path, memory_limit_mb)) as executor:
+            # Ids are fixed here, so no two jobs of the batch share temp or output files
+            futures = {
+                executor.submit(_generate_video_in_worker, script_data, channel_id, profile,
+                                self.new_video_id(channel_id)): index
+                for index, script_data in enumerate(scripts_list)
+            }
+            
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    report = future.result()
+                except Exception as e:
+                    # Worker crashed or result could not be sent back
+                    report = {'status': 'failed', 'video': None, 'error': str(e), 'elapsed_seconds': None}
+                
+                report['index'] = index
+                report['title'] = scripts_list[index].get('title')
+                reports[index] = report
+                
+                if report['status'] == 'success':
+                    print(f"✅ Video {index+1} completed in {report['elapsed_seconds']}s: {report['title']}")
+                else:
+                    print(f"❌ Error generating video {index+1}: {report['error']}")
+        
+        return reports
+
+# Per-process generator used by the batch pool
+_batch_worker_generator = None
+
+def _init_batch_worker(config_path: str, memory_limit_mb: int):
+    """Apply the per-job memory budget and build one generator per batch worker"""
+    global _batch_worker_generator
+    
+    if memory_limit_mb and resource is not None:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    
+    _batch_worker_generator = VideoGenerator(config_path)
+    
+    # The batch pool already spreads work over the cores; no nested pools per video
+    _batch_worker_generator.render_workers = 1
+    _batch_worker_generator.narration_service = None
+
+def _generate_video_in_worker(script_data: Dict, channel_id: str, profile: str, video_id: str) -> Dict:
+    """Process pool entry point: render one video and report how it went"""
+    
+    start = time.perf_counter()
+    try:
+        video = _batch_worker_generator.generate_video(script_data, channel_id, profile=profile,
+                                                       video_id=video_id)
+        report = {'status': 'success', 'video': video, 'error': None}
+    except MemoryError:
+        report = {'status': 'failed', 'video': None, 'error': 'memory limit exceeded'}
+    except Exception as e:
+        report = {'status': 'failed', 'video': None, 'error': str(e)}
+    
+    report['elapsed_seconds'] = round(time.perf_counter() - start, 2)
+    return report
+
+# Per-process generator used by the segment render pool
+_render_worker_generator = None
+
+def _init_render_worker(config_path: str):
+    """Build a TTS-free generator once in each render worker"""
+    global _render_worker_generator
+    _render_worker_generator = VideoGenerator(config_path, enable_tts=False)
+
+def _render_segment_in_worker(segment: Dict, channel: Dict, output_path: str, profile: Dict) -> str:
+    """Process pool entry point for encoding one segment"""
+    return _render_worker_generator._render_segment(segment, channel, output_path, profile)
 
 # Example usage
 if __name__ == "__main__":